@@ -11,19 +11,47 @@ import argparse
 import json
 import sys
 import os
+import re
 import time
 import csv
-from typing import Dict, Any, List, Optional, Union
+import queue
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO, Union
 from datetime import datetime
-import requests
+from pathlib import Path
 from urllib.parse import urlencode
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Constants
 API_BASE = "https://api.airtable.com/v0"
 META_API_BASE = "https://api.airtable.com/v0/meta"
-DEFAULT_PAGE_SIZE = 100
+DEFAULT_PAGE_SIZE = 100  # Airtable's maximum page size
 MAX_RECORDS_PER_REQUEST = 10
 RATE_LIMIT_DELAY = 30  # seconds
+POOL_SIZE = 10  # keep-alive connections per host
+SCHEMA_CACHE_DIR = Path.home() / '.cache' / 'airtable-cli'
+SCHEMA_CACHE_TTL = 300  # seconds
+BASE_ID_PATTERN = re.compile(r'app[A-Za-z0-9]{14}')  # only these name schema cache files
+EXPORT_BUFFER_SIZE = 1 << 20  # bytes buffered before each write to an export file
+
+def jdumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON, using orjson when it is installed.
+    
+    orjson writes non-ASCII text as UTF-8 while the json fallback keeps its
+    \\uXXXX escapes; both decode to the same data.
+    """
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+def jloads(data: Union[str, bytes]) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    return orjson.loads(data) if orjson else json.loads(data)
 
 # Color codes for output
 class Colors:
@@ -37,9 +65,14 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+@lru_cache(maxsize=None)
+def stdout_is_tty() -> bool:
+    """Check once whether stdout is a terminal (colored() runs per field)."""
+    return sys.stdout.isatty()
+
 def colored(text: str, color: str) -> str:
     """Return colored text for terminal output."""
-    if sys.stdout.isatty():
+    if stdout_is_tty():
         return f"{color}{text}{Colors.ENDC}"
     return text
 
@@ -62,19 +95,67 @@ def get_token() -> str:
     
     return token
 
+def chunked(items: Iterable[Any], size: int = MAX_RECORDS_PER_REQUEST) -> Iterator[List[Any]]:
+    """Yield lists of up to `size` items without materializing the input."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_jsonl(path: str) -> Iterator[Any]:
+    """Yield one parsed JSON value per non-blank line ('-' reads stdin)."""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield jloads(line)
+                except json.JSONDecodeError as e:
+                    print(colored(f"Invalid JSON on line {line_no}: {e}", Colors.FAIL), file=sys.stderr)
+                    sys.exit(1)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
 class AirtableAPI:
     """Direct API client for Airtable Web API."""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, schema_ttl: int = SCHEMA_CACHE_TTL):
         self.token = token
+        self.schema_ttl = schema_ttl
+        # Imported here so --help and argument errors don't pay for loading requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self.requests = requests
         self.session = requests.Session()
+        # Reuse TCP+TLS connections across pages and batches, and retry transient
+        # failures on the same pool. POST is left out so creates are never duplicated.
+        retries = Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'PATCH', 'DELETE']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retries)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
         })
     
-    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """Make HTTP request with automatic retry for rate limits."""
+    def _request(self, method: str, url: str, fatal: bool = True, **kwargs) -> 'requests.Response':
+        """Make HTTP request, waiting out Airtable's rate-limit penalty on 429.
+        
+        Transient 5xx errors and 429s with Retry-After are retried by the session's adapter.
+        Errors print a message and exit unless fatal is False, in which case they are raised.
+        """
         retries = 0
         max_retries = 3
         
@@ -83,7 +164,7 @@ class AirtableAPI:
                 response = self.session.request(method, url, **kwargs)
                 
                 if response.status_code == 429:
-                    # Rate limited
+                    # Rate limited: Airtable blocks the base for 30 seconds
                     if retries < max_retries:
                         wait_time = RATE_LIMIT_DELAY * (2 ** retries)  # Exponential backoff
                         print(colored(f"Rate limited. Waiting {wait_time} seconds...", Colors.WARNING), file=sys.stderr)
@@ -93,6 +174,9 @@ class AirtableAPI:
                     else:
                         response.raise_for_status()
                 
+                elif response.status_code in (401, 403) and not fatal:
+                    response.raise_for_status()
+                
                 elif response.status_code == 401:
                     print(colored("Authentication failed. Check your Personal Access Token.", Colors.FAIL), file=sys.stderr)
                     sys.exit(1)
@@ -105,7 +189,9 @@ class AirtableAPI:
                 response.raise_for_status()
                 return response
                 
-            except requests.exceptions.RequestException as e:
+            except self.requests.exceptions.RequestException as e:
+                if not fatal:
+                    raise
                 print(colored(f"API Error: {e}", Colors.FAIL), file=sys.stderr)
                 sys.exit(1)
     
@@ -115,16 +201,38 @@ class AirtableAPI:
         response = self._request('GET', url)
         return response.json().get('bases', [])
     
-    def get_base_schema(self, base_id: str) -> Dict[str, Any]:
-        """Get complete base schema with tables and fields."""
+    def get_base_schema(self, base_id: str, fatal: bool = True) -> Dict[str, Any]:
+        """Get complete base schema with tables and fields (cached on disk)."""
+        # Anything but a real base ID could point the cache path outside its directory
+        cache_file = SCHEMA_CACHE_DIR / f"{base_id}.json" if BASE_ID_PATTERN.fullmatch(base_id) else None
+        try:
+            if cache_file and time.time() - cache_file.stat().st_mtime < self.schema_ttl:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    return jloads(f.read())
+        except (OSError, ValueError):
+            pass
+        
         url = f"{META_API_BASE}/bases/{base_id}/tables"
-        response = self._request('GET', url)
-        return response.json()
+        response = self._request('GET', url, fatal=fatal)
+        schema = response.json()
+        
+        # Cache write failures are not fatal
+        if cache_file is None:
+            return schema
+        try:
+            SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(jdumps(schema))
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+        
+        return schema
     
-    def list_records(self, base_id: str, table_name: str, **params) -> List[Dict[str, Any]]:
-        """List records with pagination support."""
+    def iter_pages(self, base_id: str, table_name: str, **params) -> Iterator[List[Dict[str, Any]]]:
+        """Yield records one page at a time, following offsets."""
         url = f"{API_BASE}/{base_id}/{table_name}"
-        records = []
         
         # Set default page size
         if 'pageSize' not in params:
@@ -133,14 +241,19 @@ class AirtableAPI:
         while True:
             response = self._request('GET', url, params=params)
             data = response.json()
-            records.extend(data.get('records', []))
+            yield data.get('records', [])
             
             # Check for more pages
             offset = data.get('offset')
             if not offset:
                 break
             params['offset'] = offset
-        
+    
+    def list_records(self, base_id: str, table_name: str, **params) -> List[Dict[str, Any]]:
+        """List records with pagination support."""
+        records = []
+        for page in self.iter_pages(base_id, table_name, **params):
+            records.extend(page)
         return records
     
     def get_record(self, base_id: str, table_name: str, record_id: str) -> Dict[str, Any]:
@@ -149,39 +262,35 @@ class AirtableAPI:
         response = self._request('GET', url)
         return response.json()
     
-    def create_records(self, base_id: str, table_name: str, records: List[Dict[str, Any]], typecast: bool = False) -> List[Dict[str, Any]]:
-        """Create one or more records (max 10)."""
+    def create_records(self, base_id: str, table_name: str, records: Iterable[Dict[str, Any]], typecast: bool = False) -> List[Dict[str, Any]]:
+        """Create any number of records, 10 per request."""
+        return [r for batch in self.iter_create_records(base_id, table_name, records, typecast) for r in batch]
+    
+    def iter_create_records(self, base_id: str, table_name: str, records: Iterable[Dict[str, Any]], typecast: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """Create records 10 per request, yielding each batch as Airtable confirms it."""
         url = f"{API_BASE}/{base_id}/{table_name}"
-        created = []
-        
-        # Process in batches of 10
-        for i in range(0, len(records), MAX_RECORDS_PER_REQUEST):
-            batch = records[i:i + MAX_RECORDS_PER_REQUEST]
+        for batch in chunked(records):
             data = {
                 'records': [{'fields': r} for r in batch],
                 'typecast': typecast
             }
             response = self._request('POST', url, json=data)
-            created.extend(response.json().get('records', []))
-        
-        return created
+            yield response.json().get('records', [])
+    
+    def update_records(self, base_id: str, table_name: str, updates: Iterable[Dict[str, Any]], typecast: bool = False) -> List[Dict[str, Any]]:
+        """Update any number of records, 10 per request."""
+        return [r for batch in self.iter_update_records(base_id, table_name, updates, typecast) for r in batch]
     
-    def update_records(self, base_id: str, table_name: str, updates: List[Dict[str, Any]], typecast: bool = False) -> List[Dict[str, Any]]:
-        """Update one or more records (max 10)."""
+    def iter_update_records(self, base_id: str, table_name: str, updates: Iterable[Dict[str, Any]], typecast: bool = False) -> Iterator[List[Dict[str, Any]]]:
+        """Update records 10 per request, yielding each batch as Airtable confirms it."""
         url = f"{API_BASE}/{base_id}/{table_name}"
-        updated = []
-        
-        # Process in batches of 10
-        for i in range(0, len(updates), MAX_RECORDS_PER_REQUEST):
-            batch = updates[i:i + MAX_RECORDS_PER_REQUEST]
+        for batch in chunked(updates):
             data = {
                 'records': batch,
                 'typecast': typecast
             }
             response = self._request('PATCH', url, json=data)
-            updated.extend(response.json().get('records', []))
-        
-        return updated
+            yield response.json().get('records', [])
     
     def upsert_records(self, base_id: str, table_name: str, records: List[Dict[str, Any]], 
                       fields_to_merge_on: List[str], typecast: bool = False) -> Dict[str, Any]:
@@ -197,14 +306,13 @@ class AirtableAPI:
         response = self._request('PATCH', url, json=data)
         return response.json()
     
-    def delete_records(self, base_id: str, table_name: str, record_ids: List[str]) -> List[Dict[str, Any]]:
-        """Delete one or more records (max 10)."""
+    def delete_records(self, base_id: str, table_name: str, record_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Delete any number of records, 10 per request."""
         url = f"{API_BASE}/{base_id}/{table_name}"
         deleted = []
         
         # Process in batches of 10
-        for i in range(0, len(record_ids), MAX_RECORDS_PER_REQUEST):
-            batch = record_ids[i:i + MAX_RECORDS_PER_REQUEST]
+        for batch in chunked(record_ids):
             params = {'records[]': batch}
             response = self._request('DELETE', url, params=params)
             deleted.extend(response.json().get('records', []))
@@ -223,6 +331,39 @@ class AirtableAPI:
         response = self._request('PATCH', url, json=field_config)
         return response.json()
 
+def quote_formula_value(value: str) -> str:
+    """Quote a string literal for use in an Airtable formula."""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def build_filter_formula(args) -> Optional[str]:
+    """Combine --filter-formula and --filter-in into one filterByFormula."""
+    clauses = []
+    if args.filter_formula:
+        clauses.append(args.filter_formula)
+    if args.filter_in:
+        field, path = args.filter_in
+        with open(path, 'r', encoding='utf-8') as f:
+            values = [line.strip() for line in f if line.strip()]
+        if not values:
+            print(colored(f"Error: No values found in {path}", Colors.FAIL), file=sys.stderr)
+            sys.exit(1)
+        # One OR() query replaces a separate lookup per value
+        clauses.append('OR(' + ','.join(f"{{{field}}}={quote_formula_value(v)}" for v in values) + ')')
+    
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return f"AND({','.join(clauses)})"
+
+def find_table(schema: Dict[str, Any], table_name: str) -> Optional[Dict[str, Any]]:
+    """Look up a table in a base schema by name or ID."""
+    tables = {}
+    for table in schema.get('tables', []):
+        tables[table['id']] = table
+        tables.setdefault(table['name'], table)
+    return tables.get(table_name)
+
 def format_record(record: Dict[str, Any], show_metadata: bool = True) -> str:
     """Format a record for human-readable output."""
     lines = []
@@ -242,7 +383,7 @@ def format_record(record: Dict[str, Any], show_metadata: bool = True) -> str:
                 else:
                     value = ', '.join(str(v) for v in value)
             elif isinstance(value, dict):
-                value = json.dumps(value, indent=2)
+                value = jdumps(value, indent=True)
             lines.append(f"  {colored(key, Colors.BLUE)}: {value}")
     else:
         lines.append("Fields: (empty)")
@@ -301,18 +442,18 @@ def cmd_whoami(api: AirtableAPI, args) -> None:
         bases = api.list_bases()
         
         if args.json:
-            print(json.dumps({
+            print(jdumps({
                 'authenticated': True,
                 'bases_count': len(bases),
                 'token_type': 'Personal Access Token'
-            }, indent=2))
+            }, indent=True))
         else:
             print(colored("✓ Authentication successful!", Colors.GREEN))
             print(f"Token type: Personal Access Token")
             print(f"Accessible bases: {len(bases)}")
     except Exception as e:
         if args.json:
-            print(json.dumps({'authenticated': False, 'error': str(e)}, indent=2))
+            print(jdumps({'authenticated': False, 'error': str(e)}, indent=True))
         else:
             print(colored("✗ Authentication failed", Colors.FAIL))
         sys.exit(1)
@@ -322,7 +463,7 @@ def cmd_bases(api: AirtableAPI, args) -> None:
     bases = api.list_bases()
     
     if args.json:
-        print(json.dumps(bases, indent=2))
+        print(jdumps(bases, indent=True))
     else:
         if not bases:
             print("No bases found")
@@ -340,7 +481,7 @@ def cmd_schema(api: AirtableAPI, args) -> None:
     schema = api.get_base_schema(args.base_id)
     
     if args.json:
-        print(json.dumps(schema, indent=2))
+        print(jdumps(schema, indent=True))
     else:
         tables = schema.get('tables', [])
         print(colored(f"Base: {args.base_id}", Colors.BOLD))
@@ -372,12 +513,16 @@ def cmd_list(api: AirtableAPI, args) -> None:
     
     if args.fields:
         params['fields'] = args.fields
-    if args.filter_formula:
-        params['filterByFormula'] = args.filter_formula
+    filter_formula = build_filter_formula(args)
+    if filter_formula:
+        params['filterByFormula'] = filter_formula
     if args.max_records:
         params['maxRecords'] = args.max_records
     if args.page_size:
-        params['pageSize'] = min(args.page_size, 100)
+        params['pageSize'] = min(args.page_size, DEFAULT_PAGE_SIZE)
+    elif args.max_records:
+        # Don't fetch a full page when only a few records are wanted
+        params['pageSize'] = min(args.max_records, DEFAULT_PAGE_SIZE)
     if args.sort:
         # Parse sort format: field:direction,field:direction
         sort_list = []
@@ -394,7 +539,7 @@ def cmd_list(api: AirtableAPI, args) -> None:
     records = api.list_records(args.base_id, args.table_name, **params)
     
     if args.json:
-        print(json.dumps(records, indent=2))
+        print(jdumps(records, indent=True))
     else:
         if args.format == 'table':
             print(format_table(records, args.fields))
@@ -411,24 +556,50 @@ def cmd_get(api: AirtableAPI, args) -> None:
     record = api.get_record(args.base_id, args.table_name, args.record_id)
     
     if args.json:
-        print(json.dumps(record, indent=2))
+        print(jdumps(record, indent=True))
     else:
         print(format_record(record))
 
+def print_batches(batches: Iterator[List[Dict[str, Any]]], as_json: bool, verb: str) -> None:
+    """Print records batch by batch as they are written, for --jsonl runs.
+    
+    With --json each record is one line of JSON. If the run stops early (bad
+    input line, API error, Ctrl-C), everything written so far has already been
+    printed and a note says how many input records to skip when resuming.
+    """
+    count = 0
+    try:
+        for batch in batches:
+            for record in batch:
+                print(jdumps(record) if as_json else f"\n{format_record(record)}")
+            sys.stdout.flush()
+            count += len(batch)
+    except BaseException:
+        print(colored(f"Stopped after {count} record(s) were {verb.lower()}; "
+                      f"to resume, skip the first {count} records of the input", Colors.WARNING), file=sys.stderr)
+        raise
+    if not as_json:
+        print(colored(f"\n{verb} {count} record(s)", Colors.GREEN))
+
 def cmd_create(api: AirtableAPI, args) -> None:
     """Create one or more records."""
     # Parse input data
     if args.data:
         try:
-            data = json.loads(args.data)
+            data = jloads(args.data)
         except json.JSONDecodeError as e:
             print(colored(f"Invalid JSON: {e}", Colors.FAIL), file=sys.stderr)
             sys.exit(1)
     elif args.file:
         with open(args.file, 'r') as f:
-            data = json.load(f)
+            data = jloads(f.read())
+    elif args.jsonl:
+        # Records are read lazily, sent 10 at a time and printed as each batch lands
+        print_batches(api.iter_create_records(args.base_id, args.table_name, iter_jsonl(args.jsonl), args.typecast),
+                      args.json, "Created")
+        return
     else:
-        print(colored("Error: Provide --data or --file", Colors.FAIL), file=sys.stderr)
+        print(colored("Error: Provide --data, --file or --jsonl", Colors.FAIL), file=sys.stderr)
         sys.exit(1)
     
     # Ensure data is a list
@@ -438,7 +609,7 @@ def cmd_create(api: AirtableAPI, args) -> None:
     created = api.create_records(args.base_id, args.table_name, data, args.typecast)
     
     if args.json:
-        print(json.dumps(created, indent=2))
+        print(jdumps(created, indent=True))
     else:
         print(colored(f"Created {len(created)} record(s):", Colors.GREEN))
         for record in created:
@@ -449,19 +620,29 @@ def cmd_update(api: AirtableAPI, args) -> None:
     # Parse input data
     if args.data:
         try:
-            data = json.loads(args.data)
+            data = jloads(args.data)
         except json.JSONDecodeError as e:
             print(colored(f"Invalid JSON: {e}", Colors.FAIL), file=sys.stderr)
             sys.exit(1)
     elif args.file:
         with open(args.file, 'r') as f:
-            data = json.load(f)
+            data = jloads(f.read())
+    elif args.jsonl:
+        data = None
     else:
-        print(colored("Error: Provide --data or --file", Colors.FAIL), file=sys.stderr)
+        print(colored("Error: Provide --data, --file or --jsonl", Colors.FAIL), file=sys.stderr)
         sys.exit(1)
     
     # Handle single record update
-    if args.record_id:
+    if args.jsonl:
+        # Stream {id, fields} objects and send them 10 at a time
+        if args.record_id:
+            print(colored("Error: --jsonl updates take record IDs from the input, not the command line", Colors.FAIL), file=sys.stderr)
+            sys.exit(1)
+        print_batches(api.iter_update_records(args.base_id, args.table_name, iter_jsonl(args.jsonl), args.typecast),
+                      args.json, "Updated")
+        return
+    elif args.record_id:
         updates = [{'id': args.record_id, 'fields': data}]
     else:
         # Batch update - data should be list of {id, fields}
@@ -473,7 +654,7 @@ def cmd_update(api: AirtableAPI, args) -> None:
     updated = api.update_records(args.base_id, args.table_name, updates, args.typecast)
     
     if args.json:
-        print(json.dumps(updated, indent=2))
+        print(jdumps(updated, indent=True))
     else:
         print(colored(f"Updated {len(updated)} record(s):", Colors.GREEN))
         for record in updated:
@@ -484,13 +665,13 @@ def cmd_upsert(api: AirtableAPI, args) -> None:
     # Parse input data
     if args.data:
         try:
-            data = json.loads(args.data)
+            data = jloads(args.data)
         except json.JSONDecodeError as e:
             print(colored(f"Invalid JSON: {e}", Colors.FAIL), file=sys.stderr)
             sys.exit(1)
     elif args.file:
         with open(args.file, 'r') as f:
-            data = json.load(f)
+            data = jloads(f.read())
     else:
         print(colored("Error: Provide --data or --file", Colors.FAIL), file=sys.stderr)
         sys.exit(1)
@@ -502,7 +683,7 @@ def cmd_upsert(api: AirtableAPI, args) -> None:
     result = api.upsert_records(args.base_id, args.table_name, data, args.merge_on, args.typecast)
     
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(jdumps(result, indent=True))
     else:
         created = result.get('createdRecords', [])
         updated = result.get('updatedRecords', [])
@@ -527,14 +708,21 @@ def cmd_delete(api: AirtableAPI, args) -> None:
         record_ids = args.record_ids
     elif args.file:
         with open(args.file, 'r') as f:
-            data = json.load(f)
+            data = jloads(f.read())
             if isinstance(data, list):
                 record_ids = data
             else:
                 print(colored("Error: File must contain array of record IDs", Colors.FAIL), file=sys.stderr)
                 sys.exit(1)
+    elif args.ids_file:
+        if args.ids_file == '-' and not (args.force or args.json):
+            print(colored("Error: Use --force when reading record IDs from stdin", Colors.FAIL), file=sys.stderr)
+            sys.exit(1)
+        f = sys.stdin if args.ids_file == '-' else open(args.ids_file, 'r')
+        with f:
+            record_ids = [line.strip() for line in f if line.strip()]
     else:
-        print(colored("Error: Provide record IDs or --file", Colors.FAIL), file=sys.stderr)
+        print(colored("Error: Provide record IDs, --file or --ids-file", Colors.FAIL), file=sys.stderr)
         sys.exit(1)
     
     # Confirm deletion
@@ -553,7 +741,7 @@ def cmd_delete(api: AirtableAPI, args) -> None:
     deleted = api.delete_records(args.base_id, args.table_name, record_ids)
     
     if args.json:
-        print(json.dumps(deleted, indent=2))
+        print(jdumps(deleted, indent=True))
     else:
         print(colored(f"Deleted {len(deleted)} record(s):", Colors.GREEN))
         for record in deleted:
@@ -563,13 +751,7 @@ def cmd_fields(api: AirtableAPI, args) -> None:
     """List all fields with metadata."""
     schema = api.get_base_schema(args.base_id)
     
-    # Find the table
-    table = None
-    for t in schema.get('tables', []):
-        if t['id'] == args.table_name or t['name'] == args.table_name:
-            table = t
-            break
-    
+    table = find_table(schema, args.table_name)
     if not table:
         print(colored(f"Table '{args.table_name}' not found", Colors.FAIL), file=sys.stderr)
         sys.exit(1)
@@ -577,7 +759,7 @@ def cmd_fields(api: AirtableAPI, args) -> None:
     fields = table.get('fields', [])
     
     if args.json:
-        print(json.dumps(fields, indent=2))
+        print(jdumps(fields, indent=True))
     else:
         print(colored(f"Fields in {table['name']} ({len(fields)} total):\n", Colors.BOLD))
         for field in fields:
@@ -595,16 +777,66 @@ def cmd_fields(api: AirtableAPI, args) -> None:
                     print(f"    {key}: {value}")
             print()
 
+def prefetch_pages(pages: Iterator[List[Dict[str, Any]]], depth: int = 2) -> Iterator[List[Dict[str, Any]]]:
+    """Fetch pages on a background thread so writing overlaps the next request."""
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+    
+    def producer():
+        try:
+            for page in pages:
+                buffer.put(page)
+        except BaseException as e:  # Includes SystemExit from _request
+            buffer.put(e)
+        else:
+            buffer.put(done)
+    
+    threading.Thread(target=producer, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+def write_json_stream(pages: Iterator[List[Dict[str, Any]]], out: TextIO) -> int:
+    """Write records as an indented JSON array, one page at a time."""
+    count = 0
+    for page in pages:
+        for record in page:
+            out.write(',\n' if count else '[\n')
+            out.write('  ' + jdumps(record, indent=True).replace('\n', '\n  '))
+            count += 1
+    out.write('\n]\n' if count else '[]\n')
+    return count
+
+def write_csv_stream(pages: Iterator[List[Dict[str, Any]]], out: TextIO, fieldnames: List[str]) -> int:
+    """Write records as CSV rows, one page at a time."""
+    writer = csv.writer(out)
+    writer.writerow(fieldnames)
+    columns = fieldnames[2:]  # after id, createdTime
+    count = 0
+    for page in pages:
+        # Build plain rows in column order and hand the csv module a whole page at once
+        rows = []
+        for record in page:
+            fields = record.get('fields', {})
+            rows.append([record['id'], record['createdTime']] + [fields.get(c, '') for c in columns])
+        writer.writerows(rows)
+        count += len(page)
+    return count
+
 def cmd_export(api: AirtableAPI, args) -> None:
     """Export table data to CSV or JSON."""
-    # Get all records
     params = {}
     if args.view:
         params['view'] = args.view
-    if args.filter_formula:
-        params['filterByFormula'] = args.filter_formula
-    
-    records = api.list_records(args.base_id, args.table_name, **params)
+    filter_formula = build_filter_formula(args)
+    if filter_formula:
+        params['filterByFormula'] = filter_formula
+    if args.fields:
+        params['fields'] = args.fields
     
     # Determine format
     format = args.format
@@ -616,38 +848,72 @@ def cmd_export(api: AirtableAPI, args) -> None:
     else:
         format = format or 'json'
     
+    # Records are written as each page arrives rather than collected first
+    pages = prefetch_pages(api.iter_pages(args.base_id, args.table_name, **params))
+    
     if format == 'csv':
-        # Collect all field names
-        all_fields = set()
-        for record in records:
-            all_fields.update(record.get('fields', {}).keys())
-        
-        fieldnames = ['id', 'createdTime'] + sorted(list(all_fields))
+        if args.fields:
+            fieldnames = ['id', 'createdTime'] + args.fields
+        else:
+            # Take the columns, in schema order, from the table's field list
+            try:
+                table = find_table(api.get_base_schema(args.base_id, fatal=False), args.table_name)
+            except api.requests.exceptions.RequestException:
+                table = None  # e.g. token lacks schema.bases:read
+            
+            if table:
+                fieldnames = ['id', 'createdTime'] + [field['name'] for field in table.get('fields', [])]
+            else:
+                # Without a schema the columns are only known after a full pass
+                pages = [api.list_records(args.base_id, args.table_name, **params)]
+                all_fields = set()
+                for record in pages[0]:
+                    all_fields.update(record.get('fields', {}).keys())
+                fieldnames = ['id', 'createdTime'] + sorted(list(all_fields))
         
         if args.output:
-            with open(args.output, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for record in records:
-                    row = {'id': record['id'], 'createdTime': record['createdTime']}
-                    row.update(record.get('fields', {}))
-                    writer.writerow(row)
-            print(colored(f"Exported {len(records)} records to {args.output}", Colors.GREEN))
+            with open(args.output, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+                count = write_csv_stream(pages, f, fieldnames)
+            print(colored(f"Exported {count} records to {args.output}", Colors.GREEN))
         else:
-            writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
-            writer.writeheader()
-            for record in records:
-                row = {'id': record['id'], 'createdTime': record['createdTime']}
-                row.update(record.get('fields', {}))
-                writer.writerow(row)
+            write_csv_stream(pages, sys.stdout, fieldnames)
     else:  # JSON
-        output = json.dumps(records, indent=2)
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(output)
-            print(colored(f"Exported {len(records)} records to {args.output}", Colors.GREEN))
+            with open(args.output, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+                count = write_json_stream(pages, f)
+            print(colored(f"Exported {count} records to {args.output}", Colors.GREEN))
         else:
-            print(output)
+            write_json_stream(pages, sys.stdout)
+
+# Route table for subcommands
+COMMANDS = {
+    'whoami': cmd_whoami,
+    'bases': cmd_bases,
+    'schema': cmd_schema,
+    'list': cmd_list,
+    'get': cmd_get,
+    'create': cmd_create,
+    'update': cmd_update,
+    'upsert': cmd_upsert,
+    'delete': cmd_delete,
+    'fields': cmd_fields,
+    'export': cmd_export,
+}
+
+def find_command(argv: List[str]) -> Optional[str]:
+    """Return the subcommand in argv, or None if help or the full parser is needed."""
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == '--token':
+            i += 2
+        elif arg.startswith('--token=') or arg == '--refresh-schema':
+            i += 1
+        elif arg.startswith('-'):
+            return None
+        else:
+            return arg if arg in COMMANDS else None
+    return None
 
 def main():
     parser = argparse.ArgumentParser(
@@ -671,89 +937,112 @@ Environment:
     )
     
     parser.add_argument('--token', help='Personal Access Token (overrides AIRTABLE_PAT)')
+    parser.add_argument('--refresh-schema', action='store_true', help='Ignore the cached base schema and fetch it again')
     parser.add_argument('--version', action='version', version='%(prog)s 2.0.0')
     
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
+    # Only build the subparser that will be used; help and errors get the full tree
+    requested = find_command(sys.argv[1:])
+    def wanted(name: str) -> bool:
+        return requested is None or requested == name
+    
     # Common arguments for output format
     common_parser = argparse.ArgumentParser(add_help=False)
     common_parser.add_argument('--json', action='store_true', help='Output as JSON')
     
     # whoami command
-    whoami_parser = subparsers.add_parser('whoami', help='Test authentication', parents=[common_parser])
+    if wanted('whoami'):
+        whoami_parser = subparsers.add_parser('whoami', help='Test authentication', parents=[common_parser])
     
     # bases command
-    bases_parser = subparsers.add_parser('bases', help='List all accessible bases', parents=[common_parser])
+    if wanted('bases'):
+        bases_parser = subparsers.add_parser('bases', help='List all accessible bases', parents=[common_parser])
     
     # schema command
-    schema_parser = subparsers.add_parser('schema', help='Get complete base schema', parents=[common_parser])
-    schema_parser.add_argument('base_id', help='Base ID')
+    if wanted('schema'):
+        schema_parser = subparsers.add_parser('schema', help='Get complete base schema', parents=[common_parser])
+        schema_parser.add_argument('base_id', help='Base ID')
     
     # list command
-    list_parser = subparsers.add_parser('list', help='List records with filtering', parents=[common_parser])
-    list_parser.add_argument('base_id', help='Base ID')
-    list_parser.add_argument('table_name', help='Table name or ID')
-    list_parser.add_argument('--fields', nargs='+', help='Specific fields to return')
-    list_parser.add_argument('--filter-formula', help='Airtable formula for filtering')
-    list_parser.add_argument('--max-records', type=int, help='Maximum records to return')
-    list_parser.add_argument('--page-size', type=int, help='Records per page (max 100)')
-    list_parser.add_argument('--sort', nargs='+', help='Sort by field:direction (e.g., Name:asc)')
-    list_parser.add_argument('--view', help='Use a specific view')
-    list_parser.add_argument('--format', choices=['table', 'full'], default='full', help='Output format')
+    if wanted('list'):
+        list_parser = subparsers.add_parser('list', help='List records with filtering', parents=[common_parser])
+        list_parser.add_argument('base_id', help='Base ID')
+        list_parser.add_argument('table_name', help='Table name or ID')
+        list_parser.add_argument('--fields', nargs='+', help='Specific fields to return')
+        list_parser.add_argument('--filter-formula', help='Airtable formula for filtering')
+        list_parser.add_argument('--filter-in', nargs=2, metavar=('FIELD', 'FILE'), help='Match records whose FIELD equals any value in FILE (one per line)')
+        list_parser.add_argument('--max-records', type=int, help='Maximum records to return')
+        list_parser.add_argument('--page-size', type=int, help='Records per page (max 100)')
+        list_parser.add_argument('--sort', nargs='+', help='Sort by field:direction (e.g., Name:asc)')
+        list_parser.add_argument('--view', help='Use a specific view')
+        list_parser.add_argument('--format', choices=['table', 'full'], default='full', help='Output format')
     
     # get command
-    get_parser = subparsers.add_parser('get', help='Get a specific record', parents=[common_parser])
-    get_parser.add_argument('base_id', help='Base ID')
-    get_parser.add_argument('table_name', help='Table name or ID')
-    get_parser.add_argument('record_id', help='Record ID')
+    if wanted('get'):
+        get_parser = subparsers.add_parser('get', help='Get a specific record', parents=[common_parser])
+        get_parser.add_argument('base_id', help='Base ID')
+        get_parser.add_argument('table_name', help='Table name or ID')
+        get_parser.add_argument('record_id', help='Record ID')
     
     # create command
-    create_parser = subparsers.add_parser('create', help='Create records', parents=[common_parser])
-    create_parser.add_argument('base_id', help='Base ID')
-    create_parser.add_argument('table_name', help='Table name or ID')
-    create_parser.add_argument('--data', help='JSON data for fields')
-    create_parser.add_argument('--file', help='JSON file with record data')
-    create_parser.add_argument('--typecast', action='store_true', help='Enable automatic type conversion')
+    if wanted('create'):
+        create_parser = subparsers.add_parser('create', help='Create records', parents=[common_parser])
+        create_parser.add_argument('base_id', help='Base ID')
+        create_parser.add_argument('table_name', help='Table name or ID')
+        create_parser.add_argument('--data', help='JSON data for fields')
+        create_parser.add_argument('--file', help='JSON file with record data')
+        create_parser.add_argument('--jsonl', help="Newline-delimited JSON file of records ('-' for stdin)")
+        create_parser.add_argument('--typecast', action='store_true', help='Enable automatic type conversion')
     
     # update command
-    update_parser = subparsers.add_parser('update', help='Update records', parents=[common_parser])
-    update_parser.add_argument('base_id', help='Base ID')
-    update_parser.add_argument('table_name', help='Table name or ID')
-    update_parser.add_argument('record_id', nargs='?', help='Record ID (for single update)')
-    update_parser.add_argument('--data', help='JSON data for fields')
-    update_parser.add_argument('--file', help='JSON file with update data')
-    update_parser.add_argument('--typecast', action='store_true', help='Enable automatic type conversion')
+    if wanted('update'):
+        update_parser = subparsers.add_parser('update', help='Update records', parents=[common_parser])
+        update_parser.add_argument('base_id', help='Base ID')
+        update_parser.add_argument('table_name', help='Table name or ID')
+        update_parser.add_argument('record_id', nargs='?', help='Record ID (for single update)')
+        update_parser.add_argument('--data', help='JSON data for fields')
+        update_parser.add_argument('--file', help='JSON file with update data')
+        update_parser.add_argument('--jsonl', help="Newline-delimited JSON file of {id, fields} objects ('-' for stdin)")
+        update_parser.add_argument('--typecast', action='store_true', help='Enable automatic type conversion')
     
     # upsert command
-    upsert_parser = subparsers.add_parser('upsert', help='Update or create records', parents=[common_parser])
-    upsert_parser.add_argument('base_id', help='Base ID')
-    upsert_parser.add_argument('table_name', help='Table name or ID')
-    upsert_parser.add_argument('--data', help='JSON data for fields')
-    upsert_parser.add_argument('--file', help='JSON file with record data')
-    upsert_parser.add_argument('--merge-on', nargs='+', required=True, help='Fields to match for update')
-    upsert_parser.add_argument('--typecast', action='store_true', help='Enable automatic type conversion')
+    if wanted('upsert'):
+        upsert_parser = subparsers.add_parser('upsert', help='Update or create records', parents=[common_parser])
+        upsert_parser.add_argument('base_id', help='Base ID')
+        upsert_parser.add_argument('table_name', help='Table name or ID')
+        upsert_parser.add_argument('--data', help='JSON data for fields')
+        upsert_parser.add_argument('--file', help='JSON file with record data')
+        upsert_parser.add_argument('--merge-on', nargs='+', required=True, help='Fields to match for update')
+        upsert_parser.add_argument('--typecast', action='store_true', help='Enable automatic type conversion')
     
     # delete command
-    delete_parser = subparsers.add_parser('delete', help='Delete records', parents=[common_parser])
-    delete_parser.add_argument('base_id', help='Base ID')
-    delete_parser.add_argument('table_name', help='Table name or ID')
-    delete_parser.add_argument('record_ids', nargs='*', help='Record IDs to delete')
-    delete_parser.add_argument('--file', help='JSON file with record IDs')
-    delete_parser.add_argument('--force', action='store_true', help='Skip confirmation')
+    if wanted('delete'):
+        delete_parser = subparsers.add_parser('delete', help='Delete records', parents=[common_parser])
+        delete_parser.add_argument('base_id', help='Base ID')
+        delete_parser.add_argument('table_name', help='Table name or ID')
+        delete_parser.add_argument('record_ids', nargs='*', help='Record IDs to delete')
+        delete_parser.add_argument('--file', help='JSON file with record IDs')
+        delete_parser.add_argument('--ids-file', help="Text file with one record ID per line ('-' for stdin)")
+        delete_parser.add_argument('--force', action='store_true', help='Skip confirmation')
     
     # fields command
-    fields_parser = subparsers.add_parser('fields', help='List fields with metadata', parents=[common_parser])
-    fields_parser.add_argument('base_id', help='Base ID')
-    fields_parser.add_argument('table_name', help='Table name or ID')
+    if wanted('fields'):
+        fields_parser = subparsers.add_parser('fields', help='List fields with metadata', parents=[common_parser])
+        fields_parser.add_argument('base_id', help='Base ID')
+        fields_parser.add_argument('table_name', help='Table name or ID')
     
     # export command
-    export_parser = subparsers.add_parser('export', help='Export table data', parents=[common_parser])
-    export_parser.add_argument('base_id', help='Base ID')
-    export_parser.add_argument('table_name', help='Table name or ID')
-    export_parser.add_argument('--output', help='Output file')
-    export_parser.add_argument('--format', choices=['json', 'csv'], help='Export format')
-    export_parser.add_argument('--view', help='Use a specific view')
-    export_parser.add_argument('--filter-formula', help='Airtable formula for filtering')
+    if wanted('export'):
+        export_parser = subparsers.add_parser('export', help='Export table data', parents=[common_parser])
+        export_parser.add_argument('base_id', help='Base ID')
+        export_parser.add_argument('table_name', help='Table name or ID')
+        export_parser.add_argument('--output', help='Output file')
+        export_parser.add_argument('--format', choices=['json', 'csv'], help='Export format')
+        export_parser.add_argument('--view', help='Use a specific view')
+        export_parser.add_argument('--filter-formula', help='Airtable formula for filtering')
+        export_parser.add_argument('--filter-in', nargs=2, metavar=('FIELD', 'FILE'), help='Match records whose FIELD equals any value in FILE (one per line)')
+        export_parser.add_argument('--fields', nargs='+', help='Fields to export (CSV columns, in order)')
     
     args = parser.parse_args()
     
@@ -763,24 +1052,10 @@ Environment:
     
     # Get token
     token = args.token if hasattr(args, 'token') and args.token else get_token()
-    api = AirtableAPI(token)
+    api = AirtableAPI(token, schema_ttl=0 if args.refresh_schema else SCHEMA_CACHE_TTL)
     
     # Route to appropriate command
-    commands = {
-        'whoami': cmd_whoami,
-        'bases': cmd_bases,
-        'schema': cmd_schema,
-        'list': cmd_list,
-        'get': cmd_get,
-        'create': cmd_create,
-        'update': cmd_update,
-        'upsert': cmd_upsert,
-        'delete': cmd_delete,
-        'fields': cmd_fields,
-        'export': cmd_export,
-    }
-    
-    command_func = commands.get(args.command)
+    command_func = COMMANDS.get(args.command)
     if command_func:
         try:
             command_func(api, args)
@@ -4,11 +4,76 @@ Business API CLI - A tool Claude can use to interact with the business system
 """
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 
 API_BASE = "http://localhost:8000"
 
+# Shared session so repeated callbacks reuse the same connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=5, pool_maxsize=5))
+
+
+def print_business(args, data):
+    if data.get("status") == "success":
+        business = data["data"]
+        print(f"Business: {business['name']}")
+        print(f"Address: {business['address']}")
+        print(f"Phone: {business['phone']}")
+        print(f"Hours: {business['hours']}")
+        print(f"Rating: {business['rating']}")
+    else:
+        print(f"Error: {data.get('message')}")
+
+
+def print_message(args, result):
+    print(result.get("message"))
+
+
+def print_created(args, result):
+    if result.get("status") == "success":
+        print(f"Created business with ID: {result.get('business_id')}")
+    else:
+        print(f"Error: {result.get('message')}")
+
+
+def print_search(args, result):
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif result.get("status") == "success":
+        for b in result.get("data", []):
+            print(f"ID: {b['id']} - {b['name']} ({b['address']})")
+    else:
+        print(f"Error: {result.get('message')}")
+
+
+def optional_fields(args, *names):
+    """Collect the given optional arguments that were provided"""
+    return {name: getattr(args, name) for name in names if getattr(args, name)}
+
+
+# command -> (build (action, data) from args, print the callback result)
+HANDLERS = {
+    'get': (
+        lambda a: ("fetch_business_info", {"business_id": a.business_id}),
+        print_business
+    ),
+    'update': (
+        lambda a: ("update_business", {"business_id": a.business_id, **optional_fields(a, "name", "phone", "address")}),
+        print_message
+    ),
+    'create': (
+        lambda a: ("create_business", {"name": a.name, **optional_fields(a, "phone", "address")}),
+        print_created
+    ),
+    'search': (
+        lambda a: ("search_businesses", {"query": a.query}),
+        print_search
+    ),
+}
+
+
 def main():
     parser = argparse.ArgumentParser(description='Business API CLI')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
@@ -37,73 +102,16 @@ def main():
     
     args = parser.parse_args()
     
-    if args.command == 'get':
-        response = requests.post(f"{API_BASE}/callback", json={
-            "action": "fetch_business_info",
-            "data": {"business_id": args.business_id}
-        })
-        data = response.json()
-        if data.get("status") == "success":
-            business = data["data"]
-            print(f"Business: {business['name']}")
-            print(f"Address: {business['address']}")
-            print(f"Phone: {business['phone']}")
-            print(f"Hours: {business['hours']}")
-            print(f"Rating: {business['rating']}")
-        else:
-            print(f"Error: {data.get('message')}")
-            
-    elif args.command == 'update':
-        update_data = {"business_id": args.business_id}
-        if args.name:
-            update_data["name"] = args.name
-        if args.phone:
-            update_data["phone"] = args.phone
-        if args.address:
-            update_data["address"] = args.address
-            
-        response = requests.post(f"{API_BASE}/callback", json={
-            "action": "update_business",
-            "data": update_data
-        })
-        print(response.json().get("message"))
-        
-    elif args.command == 'create':
-        create_data = {"name": args.name}
-        if args.phone:
-            create_data["phone"] = args.phone
-        if args.address:
-            create_data["address"] = args.address
-            
-        response = requests.post(f"{API_BASE}/callback", json={
-            "action": "create_business",
-            "data": create_data
-        })
-        result = response.json()
-        if result.get("status") == "success":
-            print(f"Created business with ID: {result.get('business_id')}")
-        else:
-            print(f"Error: {result.get('message')}")
-            
-    elif args.command == 'search':
-        response = requests.post(f"{API_BASE}/callback", json={
-            "action": "search_businesses",
-            "data": {"query": args.query}
-        })
-        result = response.json()
-        
-        if args.json:
-            print(json.dumps(result, indent=2))
-        else:
-            if result.get("status") == "success":
-                businesses = result.get("data", [])
-                for b in businesses:
-                    print(f"ID: {b['id']} - {b['name']} ({b['address']})")
-            else:
-                print(f"Error: {result.get('message')}")
-    
-    else:
+    handler = HANDLERS.get(args.command)
+    if not handler:
         parser.print_help()
+        return
+    
+    build_request, print_result = handler
+    action, data = build_request(args)
+    response = SESSION.post(f"{API_BASE}/callback", json={"action": action, "data": data})
+    print_result(args, response.json())
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
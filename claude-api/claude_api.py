@@ -5,23 +5,133 @@ Claude API Server - Simple HTTP API for Claude Code
 import asyncio
 import json
 import os
+import shutil
 import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import AsyncIterator, DefaultDict, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-app = FastAPI(title="Claude API", version="0.1.0")
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
 # Configuration
 WORKSPACES_DIR = Path("/tmp/claude-workspaces")
 WORKSPACES_DIR.mkdir(exist_ok=True)
+WORKER_LINE_LIMIT = 16 * 1024 * 1024  # a whole reply arrives as one stream-json line
 
-# In-memory session tracking (could be Redis in production)
-sessions: Dict[str, dict] = {}
+# Environment for claude workers, with the tool library in PATH (fixed per process)
+TOOL_BIN_PATH = "/Users/pete/Projects/tool-library/bin"
+CLAUDE_ENV = {
+    **os.environ,
+    "PATH": f"{TOOL_BIN_PATH}:{os.environ['PATH']}" if "PATH" in os.environ else TOOL_BIN_PATH
+}
+
+REDIS_URL = os.environ.get("REDIS_URL")  # share sessions across workers/hosts when set
+SESSION_TTL = 86400  # seconds of inactivity before a Redis session expires
+
+
+class MemorySessionStore:
+    """Process-local session tracking (default)"""
+    
+    def __init__(self):
+        self.sessions: Dict[str, dict] = {}
+    
+    async def get(self, session_id: str) -> Optional[dict]:
+        return self.sessions.get(session_id)
+    
+    async def set(self, session_id: str, info: dict):
+        self.sessions[session_id] = info
+    
+    async def delete(self, session_id: str):
+        self.sessions.pop(session_id, None)
+    
+    async def list(self) -> List[dict]:
+        return list(self.sessions.values())
+    
+    async def close(self):
+        pass
+
+
+class RedisSessionStore:
+    """Session tracking in Redis so multiple uvicorn workers can share state"""
+    
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self.redis = redis.from_url(url)
+    
+    async def get(self, session_id: str) -> Optional[dict]:
+        data = await self.redis.get(f"session:{session_id}")
+        return json.loads(data) if data else None
+    
+    async def set(self, session_id: str, info: dict):
+        await self.redis.set(f"session:{session_id}", json.dumps(info), ex=SESSION_TTL)
+    
+    async def delete(self, session_id: str):
+        await self.redis.delete(f"session:{session_id}")
+    
+    async def list(self) -> List[dict]:
+        keys = [key async for key in self.redis.scan_iter(match="session:*")]
+        if not keys:
+            return []
+        return [json.loads(data) for data in await self.redis.mget(keys) if data]
+    
+    async def close(self):
+        # aclose() from redis 5.0.1 on; older clients only have close()
+        await getattr(self.redis, "aclose", self.redis.close)()
+
+
+sessions = MemorySessionStore()
+
+# Shared pool for blocking filesystem work, and a queue of workspaces to remove
+executor = ThreadPoolExecutor(max_workers=4)
+cleanup_queue: "asyncio.Queue[Path]" = asyncio.Queue()
+
+
+async def cleanup_workspaces():
+    """Delete queued workspaces one at a time off the event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        workspace = await cleanup_queue.get()
+        try:
+            await loop.run_in_executor(executor, shutil.rmtree, workspace, True)
+        finally:
+            cleanup_queue.task_done()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the session store and cleanup worker; on exit close workers, finish
+    queued workspace removals and close the store"""
+    global sessions
+    if REDIS_URL:
+        sessions = RedisSessionStore(REDIS_URL)
+    cleanup_task = asyncio.create_task(cleanup_workspaces())
+    try:
+        yield
+    finally:
+        await asyncio.gather(*(worker.close() for worker in workers.values()))
+        workers.clear()
+        await cleanup_queue.join()  # deleted sessions' workspaces shouldn't outlive the server
+        cleanup_task.cancel()
+        try:
+            await cleanup_task
+        except asyncio.CancelledError:
+            pass
+        await sessions.close()
+
+
+app = FastAPI(title="Claude API", version="0.1.0",
+              default_response_class=DefaultResponse, lifespan=lifespan)
 
 
 class SessionCreateRequest(BaseModel):
@@ -111,56 +221,166 @@ curl -X POST http://localhost:8000/callback \
     claude_md_path.write_text(claude_md_content)
 
 
-async def execute_claude(prompt: str, workspace: Path, continue_session: bool = False) -> dict:
-    """Execute claude command and return the response"""
+class ClaudeWorker:
+    """Long-lived claude process for one workspace, driven over stream-json stdin/stdout"""
     
-    # Ensure CLAUDE.md exists for tool access
-    if not (workspace / "CLAUDE.md").exists():
-        create_session_claude_md(workspace)
+    def __init__(self, process: asyncio.subprocess.Process, workspace: Path):
+        self.process = process
+        self.workspace = workspace
+        self.lock = asyncio.Lock()
+        self.abandoned = False
     
-    # Build command with allowed tools - using stdin for prompt
-    cmd = ["claude", "--print", "--allowedTools", "Bash,Read,Write,Edit,WebSearch,WebFetch"]
-    if continue_session and (workspace / ".claude").exists():
-        cmd.append("--continue")
+    @property
+    def alive(self) -> bool:
+        return not self.abandoned and self.process.returncode is None
     
-    # Set up environment with tool library in PATH
-    env = os.environ.copy()
-    tool_bin_path = "/Users/pete/Projects/tool-library/bin"
-    if "PATH" in env:
-        env["PATH"] = f"{tool_bin_path}:{env['PATH']}"
-    else:
-        env["PATH"] = tool_bin_path
+    def abandon(self):
+        """Kill a worker left mid-turn, so its unread output can't answer the next prompt"""
+        self.abandoned = True
+        if self.process.returncode is None:
+            self.process.kill()
+        if workers.get(self.workspace) is self:
+            del workers[self.workspace]
     
-    try:
+    async def events(self, prompt: str) -> AsyncIterator[dict]:
+        """Send one user turn and yield stream-json events up to its result"""
+        finished = False
+        try:
+            message = {"type": "user", "message": {"role": "user", "content": prompt}}
+            self.process.stdin.write(json.dumps(message).encode() + b"\n")
+            await self.process.stdin.drain()
+            
+            # Anything that isn't a stream-json event is stderr noise; keep it for errors
+            noise = []
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    finished = True
+                    yield {
+                        "type": "result",
+                        "is_error": True,
+                        "result": "".join(noise) or "claude worker exited"
+                    }
+                    return
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    noise.append(line.decode(errors="replace"))
+                    continue
+                finished = event.get("type") == "result"
+                yield event
+                if finished:
+                    return
+        finally:
+            # Cancelled, closed or failed before the result: the rest of this
+            # turn is still queued on stdout, so the process can't be reused
+            if not finished:
+                self.abandon()
+    
+    async def send(self, prompt: str) -> dict:
+        """Send one user turn and wait for its result"""
+        turn = self.events(prompt)
+        try:
+            async for event in turn:
+                if event.get("type") == "result":
+                    if event.get("is_error"):
+                        return {"success": False, "error": event.get("result"), "response": None}
+                    return {"success": True, "response": event.get("result", ""), "error": None}
+        finally:
+            await turn.aclose()
+    
+    async def close(self):
+        if self.alive:
+            self.process.terminate()
+            await self.process.wait()
+
+
+# One worker per session workspace, spawned on first use
+workers: Dict[Path, ClaudeWorker] = {}
+# Held while checking for and spawning a workspace's worker, so concurrent
+# first messages share one process instead of orphaning extras
+spawn_locks: DefaultDict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def get_worker(workspace: Path, continue_session: bool) -> ClaudeWorker:
+    """Return the live worker for a workspace, spawning one if needed"""
+    worker = workers.get(workspace)
+    if worker and worker.alive:
+        return worker
+    
+    async with spawn_locks[workspace]:
+        worker = workers.get(workspace)
+        if worker and worker.alive:
+            return worker  # another request spawned it while we waited
+        
+        # Build command with allowed tools - prompts arrive as stream-json on stdin
+        cmd = ["claude", "--print", "--verbose",
+               "--input-format", "stream-json", "--output-format", "stream-json",
+               "--allowedTools", "Bash,Read,Write,Edit,WebSearch,WebFetch"]
+        if continue_session and (workspace / ".claude").exists():
+            cmd.append("--continue")
+        
         # Debug: print the command
-        print(f"Executing command: {' '.join(cmd)}")
-        print(f"With prompt: {prompt}")
+        print(f"Starting worker: {' '.join(cmd)}")
         
-        # Execute command with stdin
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
             cwd=str(workspace),
-            env=env
+            env=CLAUDE_ENV,
+            limit=WORKER_LINE_LIMIT
         )
+        worker = ClaudeWorker(process, workspace)
+        workers[workspace] = worker
+        return worker
+
+
+async def stream_claude(prompt: str, workspace: Path, continue_session: bool = False) -> AsyncIterator[str]:
+    """Send a prompt to the session's claude worker and yield the reply as SSE events"""
+    
+    # Ensure CLAUDE.md exists for tool access
+    if not (workspace / "CLAUDE.md").exists():
+        create_session_claude_md(workspace)
+    
+    try:
+        worker = await get_worker(workspace, continue_session)
+        async with worker.lock:
+            # Close the turn right away if the client disconnects, rather than
+            # whenever the generator is collected, so the worker is dropped first
+            turn = worker.events(prompt)
+            try:
+                async for event in turn:
+                    if event.get("type") == "assistant":
+                        for item in event.get("message", {}).get("content", []):
+                            if item.get("type") == "text":
+                                yield f"data: {json.dumps({'type': 'text', 'text': item['text']})}\n\n"
+                    elif event.get("type") == "result":
+                        done = {
+                            "type": "error" if event.get("is_error") else "done",
+                            "response": event.get("result")
+                        }
+                        yield f"data: {json.dumps(done)}\n\n"
+            finally:
+                await turn.aclose()
+    except Exception as e:
+        yield f"data: {json.dumps({'type': 'error', 'response': str(e)})}\n\n"
+
+
+async def execute_claude(prompt: str, workspace: Path, continue_session: bool = False) -> dict:
+    """Send a prompt to the session's claude worker and return the response"""
+    
+    # Ensure CLAUDE.md exists for tool access
+    if not (workspace / "CLAUDE.md").exists():
+        create_session_claude_md(workspace)
+    
+    try:
+        worker = await get_worker(workspace, continue_session)
         
-        # Send prompt via stdin
-        stdout, stderr = await process.communicate(input=prompt.encode())
-        
-        if process.returncode != 0:
-            return {
-                "success": False,
-                "error": stderr.decode(),
-                "response": None
-            }
-        
-        return {
-            "success": True,
-            "response": stdout.decode(),
-            "error": None
-        }
+        # A worker handles one turn at a time
+        async with worker.lock:
+            return await worker.send(prompt)
         
     except Exception as e:
         return {
@@ -196,7 +416,7 @@ async def create_session(request: SessionCreateRequest):
     session.workspace.mkdir(exist_ok=True)
     
     # Store session info
-    sessions[session_id] = session.to_dict()
+    await sessions.set(session_id, session.to_dict())
     
     response_data = {
         "session": session.to_dict(),
@@ -218,33 +438,43 @@ async def create_session(request: SessionCreateRequest):
 @app.get("/sessions")
 async def list_sessions():
     """List all active sessions"""
+    all_sessions = await sessions.list()
     return {
-        "sessions": list(sessions.values()),
-        "count": len(sessions)
+        "sessions": all_sessions,
+        "count": len(all_sessions)
     }
 
 
 @app.get("/sessions/{session_id}")
 async def get_session(session_id: str):
     """Get session information"""
-    if session_id not in sessions:
+    session = await sessions.get(session_id)
+    if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return sessions[session_id]
+    return session
 
 
 @app.post("/sessions/{session_id}/messages")
-async def send_message(session_id: str, request: MessageRequest):
-    """Send a message to an existing session"""
-    if session_id not in sessions:
+async def send_message(session_id: str, request: MessageRequest, stream: bool = False):
+    """Send a message to an existing session (stream=true for server-sent events)"""
+    session = await sessions.get(session_id)
+    if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
     workspace = WORKSPACES_DIR / session_id
     if not workspace.exists():
         raise HTTPException(status_code=500, detail="Session workspace not found")
     
-    # Update last used time
-    sessions[session_id]["last_used"] = datetime.utcnow().isoformat()
+    # Update last used time (also refreshes the Redis TTL)
+    session["last_used"] = datetime.utcnow().isoformat()
+    await sessions.set(session_id, session)
+    
+    if stream:
+        return StreamingResponse(
+            stream_claude(request.prompt, workspace, continue_session=True),
+            media_type="text/event-stream"
+        )
     
     # Execute claude with --continue flag
     result = await execute_claude(request.prompt, workspace, continue_session=True)
@@ -263,17 +493,22 @@ async def send_message(session_id: str, request: MessageRequest):
 @app.delete("/sessions/{session_id}")
 async def delete_session(session_id: str):
     """Delete a session and its workspace"""
-    if session_id not in sessions:
+    if not await sessions.get(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Remove workspace
+    # Stop the session's claude worker
     workspace = WORKSPACES_DIR / session_id
+    worker = workers.pop(workspace, None)
+    spawn_locks.pop(workspace, None)
+    if worker:
+        await worker.close()
+    
+    # Remove workspace in the background so the request returns immediately
     if workspace.exists():
-        import shutil
-        shutil.rmtree(workspace)
+        cleanup_queue.put_nowait(workspace)
     
     # Remove from sessions
-    del sessions[session_id]
+    await sessions.delete(session_id)
     
     return {"message": "Session deleted", "session_id": session_id}
 
@@ -321,4 +556,13 @@ async def handle_callback(request: CallbackRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Claude workers are per process, so only run several workers with REDIS_URL set
+    uvicorn.run(
+        "claude_api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("API_WORKERS", "1")),
+        access_log=False
+    )
\ No newline at end of file
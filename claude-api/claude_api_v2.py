@@ -5,22 +5,110 @@ Claude API v2 - Enhanced with persistent shareable sessions
 import asyncio
 import json
 import os
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, DefaultDict, Dict, List, Optional, Set, Tuple
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    orjson = None
+    DefaultResponse = JSONResponse
+
 from session_manager import ClaudeSessionManager
 
-app = FastAPI(title="Claude API v2", version="2.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the metadata flusher for the app's lifetime; close workers and flush on exit"""
+    flush_task = asyncio.create_task(_flush_metadata())
+    try:
+        yield
+    finally:
+        flush_task.cancel()
+        await asyncio.gather(*(worker.close() for worker in workers.values()))
+        workers.clear()
+        if _dirty.is_set():
+            session_manager.save_metadata()
+
+
+app = FastAPI(title="Claude API v2", version="2.0.0",
+              default_response_class=DefaultResponse, lifespan=lifespan)
 session_manager = ClaudeSessionManager()
 
-# WebSocket connections for real-time updates
-active_connections: Dict[str, List[WebSocket]] = {}
+# WebSocket subscribers for real-time updates
+active_connections: DefaultDict[str, Set["Subscriber"]] = defaultdict(set)
+WS_QUEUE_SIZE = 64  # frames a client may fall behind before it is dropped
+
+# Base claude worker invocation (prompts arrive as stream-json on stdin);
+# --resume is appended when continuing a session
+_BASE_CMD = ("claude", "--print", "--verbose",
+             "--input-format", "stream-json", "--output-format", "stream-json",
+             "--allowedTools", "Bash,Read,Write,Edit,WebSearch,WebFetch")
+WORKER_LINE_LIMIT = 16 * 1024 * 1024  # a whole reply arrives as one stream-json line
+
+# Cap on concurrent claude turns; excess requests wait for a slot
+CLAUDE_MAX_CONCURRENCY = int(os.environ.get("CLAUDE_MAX_CONCURRENCY", "4"))
+_CLAUDE_SEM = asyncio.Semaphore(CLAUDE_MAX_CONCURRENCY)
+
+# Cap on live claude workers; idle ones beyond it are closed and later resumed
+CLAUDE_MAX_WORKERS = int(os.environ.get("CLAUDE_MAX_WORKERS", "16"))
+
+# Environment template for claude subprocesses; per-session keys are overlaid
+TOOL_BIN_PATH = "/Users/pete/Projects/tool-library/bin"
+_BASE_ENV = {**os.environ, "PATH": f"{TOOL_BIN_PATH}:{os.environ.get('PATH', '')}"}
+
+# Sent to the original session when it is cloned (str.format placeholders)
+_FORK_PROMPT_TMPL = """IMPORTANT: You need to fork your knowledge to a new session.
+
+A new session has been created as a fork of your current session. You need to transfer your knowledge to it.
+
+Please execute the following steps:
+1. Summarize everything important from our conversation
+2. Send this knowledge to the fork using this command:
+
+```bash
+curl -X POST http://localhost:8001/sessions/{new_session_id}/receive-knowledge \\
+  -H "Content-Type: application/json" \\
+  -d '{{"from_session": "{session_id}", "knowledge": "<YOUR_SUMMARY_HERE>"}}'
+```
+
+Replace <YOUR_SUMMARY_HERE> with a comprehensive summary including:
+- All shared facts and context
+- Project state and decisions
+- Important files and their purposes
+- Current objectives and progress
+- Any other relevant information
+
+This will ensure your fork has all necessary context to continue the work."""
+
+# Sent to a fork along with the knowledge its parent transferred
+_INIT_PROMPT_TMPL = """You are a fork of another Claude session. You have just received a knowledge transfer from your parent session.
+
+---KNOWLEDGE TRANSFER FROM PARENT---
+{knowledge}
+---END TRANSFER---
+
+Please:
+1. Acknowledge receipt of this knowledge
+2. Summarize what you now know
+3. Register your session ID as instructed in CLAUDE.md
+4. Indicate you're ready to continue the work"""
+
+# Set when session metadata changes; _flush_metadata writes it out shortly after
+_dirty = asyncio.Event()
+METADATA_FLUSH_DELAY = 0.25
+
+# Newest Claude session file per project dir, keyed on the dir's mtime
+_newest_jsonl_cache: Dict[Path, Tuple[float, Optional[str]]] = {}
 
 
 class SessionCreateRequest(BaseModel):
@@ -42,84 +130,241 @@ class SessionUpdateRequest(BaseModel):
     shared: Optional[bool] = None
 
 
-async def execute_claude(prompt: str, workspace: Path, session_id: str, 
-                        continue_session: bool = False) -> dict:
-    """Execute claude command with session awareness"""
+def _find_newest_jsonl(project_dir: Path) -> Optional[str]:
+    """Return the stem of the newest .jsonl file in project_dir, or None.
+
+    Creating a new Claude session adds a file and bumps the directory mtime,
+    so the result is reused until the directory changes.
+    """
+    try:
+        dir_mtime = project_dir.stat().st_mtime
+    except FileNotFoundError:
+        return None
     
-    # Build command
-    cmd = ["claude", "--print", "--allowedTools", "Bash,Read,Write,Edit,WebSearch,WebFetch"]
+    cached = _newest_jsonl_cache.get(project_dir)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
     
-    # Check if we should resume an existing Claude session
-    session_info = session_manager.sessions.get(session_id, {})
-    claude_session_id = session_info.get('claude_session_id')
+    newest_stem, newest_mtime = None, -1.0
+    with os.scandir(project_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".jsonl"):
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime > newest_mtime:
+                newest_stem, newest_mtime = entry.name[:-len(".jsonl")], mtime
     
-    if continue_session and claude_session_id:
-        # Use --resume with the actual Claude session ID
-        cmd.extend(["--resume", claude_session_id])
+    _newest_jsonl_cache[project_dir] = (dir_mtime, newest_stem)
+    return newest_stem
+
+
+def _dumps(data: dict) -> str:
+    """Serialize to a JSON string, with orjson when available"""
+    return orjson.dumps(data).decode() if orjson else json.dumps(data)
+
+
+async def _flush_metadata():
+    """Coalesce metadata changes into one sessions.json write per flush window"""
+    while True:
+        await _dirty.wait()
+        await asyncio.sleep(METADATA_FLUSH_DELAY)
+        _dirty.clear()
+        # Serialize on the loop so handlers can't mutate sessions mid-dump
+        data = session_manager.dump_metadata()
+        await asyncio.to_thread(session_manager.save_metadata, data)
+
+
+async def _find_newest_jsonl_async(project_dir: Path) -> Optional[str]:
+    """Run _find_newest_jsonl in a thread so directory I/O doesn't block the loop"""
+    return await asyncio.to_thread(_find_newest_jsonl, project_dir)
+
+
+def _sync_write_json(path: Path, data: dict):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def _sync_read_json(path: Path) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+async def _write_json(path: Path, data: dict):
+    """Write a JSON file without blocking the event loop"""
+    await asyncio.to_thread(_sync_write_json, path, data)
+
+
+async def _read_json(path: Path) -> dict:
+    """Read a JSON file without blocking the event loop"""
+    return await asyncio.to_thread(_sync_read_json, path)
+
+
+class ClaudeWorker:
+    """Long-lived claude process for one session, driven over stream-json stdin/stdout"""
     
-    # Set up environment
-    env = os.environ.copy()
-    tool_bin_path = "/Users/pete/Projects/tool-library/bin"
-    env["PATH"] = f"{tool_bin_path}:{env.get('PATH', '')}"
+    def __init__(self, process: asyncio.subprocess.Process, session_id: str):
+        self.process = process
+        self.session_id = session_id
+        self.lock = asyncio.Lock()
+        self.claude_session_id: Optional[str] = None
+        self.abandoned = False
     
-    # Add session context to environment
-    env["CLAUDE_SESSION_ID"] = session_id
-    env["CLAUDE_SESSION_NAME"] = session_manager.sessions.get(session_id, {}).get('name', '')
+    @property
+    def alive(self) -> bool:
+        return not self.abandoned and self.process.returncode is None
     
-    try:
+    def abandon(self):
+        """Kill a worker left mid-turn, so its unread output can't answer the next prompt"""
+        self.abandoned = True
+        if self.process.returncode is None:
+            self.process.kill()
+        if workers.get(self.session_id) is self:
+            del workers[self.session_id]
+    
+    async def send(self, prompt: str) -> dict:
+        """Send one user turn and wait for its result"""
+        try:
+            message = {"type": "user", "message": {"role": "user", "content": prompt}}
+            self.process.stdin.write(json.dumps(message).encode() + b"\n")
+            await self.process.stdin.drain()
+            
+            # Anything that isn't a stream-json event is stderr noise; keep it for errors
+            noise = []
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    return {
+                        "success": False,
+                        "error": "".join(noise) or "claude worker exited",
+                        "response": None
+                    }
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    noise.append(line.decode(errors="replace"))
+                    continue
+                if event.get("type") == "result":
+                    self.claude_session_id = event.get("session_id") or self.claude_session_id
+                    if event.get("is_error"):
+                        return {"success": False, "error": event.get("result"), "response": None}
+                    return {"success": True, "response": event.get("result", ""), "error": None}
+        except BaseException:
+            # Cancelled or failed mid-turn: the rest of the turn is still queued
+            # on stdout, so the process can't be reused
+            self.abandon()
+            raise
+    
+    async def close(self):
+        if self.alive:
+            self.process.terminate()
+            await self.process.wait()
+
+
+# Live worker per API session, least recently used first
+workers: "OrderedDict[str, ClaudeWorker]" = OrderedDict()
+# Held while a session's worker is being replaced or spawned
+spawn_locks: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def _evict_idle_workers():
+    """Close least recently used idle workers to stay under CLAUDE_MAX_WORKERS"""
+    for session_id, worker in list(workers.items()):
+        if len(workers) < CLAUDE_MAX_WORKERS:
+            return
+        # Another eviction may have got here first while we awaited a close
+        if not worker.lock.locked() and workers.get(session_id) is worker:
+            del workers[session_id]
+            await worker.close()
+
+
+async def get_worker(session_id: str, workspace: Path, sess: Optional[dict],
+                     continue_session: bool) -> ClaudeWorker:
+    """Return the session's live worker, spawning one if needed.
+
+    continue_session=False always starts a fresh conversation.
+    """
+    worker = workers.get(session_id)
+    if worker and worker.alive and continue_session:
+        workers.move_to_end(session_id)
+        return worker
+    
+    # Check and spawn under the session's lock, so concurrent requests can't
+    # each start a process and orphan all but the last
+    async with spawn_locks[session_id]:
+        worker = workers.get(session_id)
+        if worker and worker.alive and continue_session:
+            workers.move_to_end(session_id)
+            return worker  # another request spawned it while we waited
+        if worker:
+            async with worker.lock:
+                await worker.close()
+            if workers.get(session_id) is worker:
+                del workers[session_id]
+        await _evict_idle_workers()
+        
+        # Use --resume with the actual Claude session ID
+        claude_session_id = sess.get('claude_session_id') if sess else None
+        if continue_session and claude_session_id:
+            cmd = _BASE_CMD + ("--resume", claude_session_id)
+        else:
+            cmd = _BASE_CMD
+        
+        # Set up environment with session context
+        env = _BASE_ENV.copy()
+        env["CLAUDE_SESSION_ID"] = session_id
+        env["CLAUDE_SESSION_NAME"] = sess.get('name', '') if sess else ''
+        
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
             cwd=str(workspace),
-            env=env
+            env=env,
+            limit=WORKER_LINE_LIMIT
         )
+        worker = ClaudeWorker(process, session_id)
+        workers[session_id] = worker
+        return worker
+
+
+async def execute_claude(prompt: str, workspace: Path, session_id: str, 
+                        continue_session: bool = False) -> dict:
+    """Send a prompt to the session's claude worker with session awareness"""
+    sess = session_manager.sessions.get(session_id)
+    
+    try:
+        worker = await get_worker(session_id, workspace, sess, continue_session)
         
-        stdout, stderr = await process.communicate(input=prompt.encode())
-        
-        if process.returncode != 0:
-            return {
-                "success": False,
-                "error": stderr.decode(),
-                "response": None
-            }
-        
-        # Update session activity and capture Claude session ID
-        if session_id in session_manager.sessions:
-            session_manager.sessions[session_id]["last_accessed"] = datetime.utcnow().isoformat()
-            session_manager.sessions[session_id]["message_count"] += 1
-            
-            # If this is the first interaction, find and store Claude's session ID
-            if not session_manager.sessions[session_id].get('claude_session_id'):
-                # Look for the session ID in Claude's project directory
-                claude_projects_dir = Path.home() / ".claude" / "projects"
-                workspace_name = str(workspace).replace("/tmp/", "/private/tmp/").replace("/", "-")
-                project_dir = claude_projects_dir / workspace_name
-                
-                if project_dir.exists():
-                    # Get the most recent .jsonl file (Claude's session)
-                    jsonl_files = list(project_dir.glob("*.jsonl"))
-                    if jsonl_files:
-                        # Sort by modification time, get the newest
-                        newest_file = max(jsonl_files, key=lambda p: p.stat().st_mtime)
-                        claude_session_id = newest_file.stem  # filename without .jsonl
-                        session_manager.sessions[session_id]["claude_session_id"] = claude_session_id
-            
-            session_manager.save_metadata()
-        
-        return {
-            "success": True,
-            "response": stdout.decode(),
-            "error": None
-        }
-        
+        # A worker handles one turn at a time
+        async with worker.lock, _CLAUDE_SEM:
+            result = await worker.send(prompt)
     except Exception as e:
         return {
             "success": False,
             "error": str(e),
             "response": None
         }
+    
+    if not result["success"]:
+        return result
+    
+    # Update session activity and capture Claude session ID
+    if sess is not None:
+        sess["last_accessed"] = datetime.utcnow().isoformat()
+        sess["message_count"] += 1
+        
+        # The result event names the session to resume; if it didn't (older
+        # CLIs), the most recent .jsonl file in Claude's project directory is it
+        claude_session_id = worker.claude_session_id
+        if not claude_session_id and not sess.get('claude_session_id'):
+            claude_session_id = await _find_newest_jsonl_async(session_manager.project_dir(sess))
+        if claude_session_id:
+            sess["claude_session_id"] = claude_session_id
+        
+        _dirty.set()
+    
+    return result
 
 
 @app.get("/")
@@ -137,11 +382,11 @@ async def root():
             "Team collaboration"
         ],
         "endpoints": {
-            "POST /sessions": "Create a new persistent session",
+            "POST /sessions": "Create a new persistent session (?stream=true for NDJSON)",
             "GET /sessions": "List active sessions",
             "GET /sessions/{id}": "Get session details",
             "POST /sessions/{id}/messages": "Send message to session",
-            "GET /sessions/{id}/history": "Get full session history",
+            "GET /sessions/{id}/history": "Get full session history (?stream=true for NDJSON)",
             "GET /sessions/{id}/summary": "Get session summary",
             "PUT /sessions/{id}": "Update session metadata",
             "POST /sessions/{id}/clone": "Clone a session",
@@ -151,9 +396,23 @@ async def root():
     }
 
 
+def _initial_result(result: dict) -> dict:
+    if result["success"]:
+        return {"initial_response": result["response"]}
+    return {"error": result["error"]}
+
+
+async def stream_created_session(session: dict, initial: Optional[asyncio.Task]) -> AsyncIterator[str]:
+    """Yield the new session as NDJSON right away, then the initial response once ready"""
+    yield _dumps({"session": session}) + "\n"
+    if initial is not None:
+        # Shielded so a client disconnect doesn't cancel the turn mid-flight
+        yield _dumps(_initial_result(await asyncio.shield(initial))) + "\n"
+
+
 @app.post("/sessions")
-async def create_session(request: SessionCreateRequest):
-    """Create a new persistent session"""
+async def create_session(request: SessionCreateRequest, stream: bool = False):
+    """Create a new persistent session (stream=true to get it before the initial response)"""
     session = await session_manager.create_session(
         name=request.name,
         description=request.description,
@@ -161,23 +420,25 @@ async def create_session(request: SessionCreateRequest):
         tags=request.tags
     )
     
-    response_data = {"session": session}
-    
-    # Send initial prompt if provided
+    # Send initial prompt if provided; it runs while the response is prepared
+    initial = None
     if request.initial_prompt:
-        workspace = Path(session['workspace'])
-        result = await execute_claude(
+        initial = asyncio.create_task(execute_claude(
             request.initial_prompt, 
-            workspace, 
+            Path(session['workspace']), 
             session['id'],
             continue_session=False
+        ))
+    
+    if stream:
+        return StreamingResponse(
+            stream_created_session(session, initial),
+            media_type="application/x-ndjson"
         )
-        
-        if result["success"]:
-            response_data["initial_response"] = result["response"]
-        else:
-            response_data["error"] = result["error"]
     
+    response_data = {"session": session}
+    if initial is not None:
+        response_data.update(_initial_result(await asyncio.shield(initial)))
     return response_data
 
 
@@ -206,43 +467,72 @@ async def get_session(session_id: str):
     return session
 
 
+def format_history_entry(entry: dict) -> Optional[dict]:
+    """Format one transcript entry for easy reading (None for non-message entries)"""
+    if entry.get('type') == 'user':
+        return {
+            "role": "user",
+            "content": entry['message']['content'],
+            "timestamp": entry['timestamp']
+        }
+    elif entry.get('type') == 'assistant':
+        message = entry.get('message', {})
+        content_items = message.get('content', [])
+        content_text = ""
+        tools_used = []
+        
+        for item in content_items:
+            if item.get('type') == 'text':
+                content_text += item.get('text', '')
+            elif item.get('type') == 'tool_use':
+                tools_used.append({
+                    "tool": item.get('name'),
+                    "input": item.get('input')
+                })
+        
+        return {
+            "role": "assistant",
+            "content": content_text,
+            "tools_used": tools_used,
+            "timestamp": entry['timestamp']
+        }
+    return None
+
+
+async def _chain_first(first: dict, rest: AsyncIterator[dict]) -> AsyncIterator[dict]:
+    yield first
+    async for entry in rest:
+        yield entry
+
+
+async def stream_history(session_id: str, history: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Yield formatted history entries as NDJSON lines, then a message_count trailer"""
+    count = 0
+    async for entry in history:
+        formatted = format_history_entry(entry)
+        if formatted is not None:
+            count += 1
+            yield _dumps(formatted) + "\n"
+    yield _dumps({"session_id": session_id, "message_count": count}) + "\n"
+
+
 @app.get("/sessions/{session_id}/history")
-async def get_session_history(session_id: str):
-    """Get full session conversation history"""
-    history = await session_manager.get_session_history(session_id)
-    if not history:
+async def get_session_history(session_id: str, stream: bool = False):
+    """Get full session conversation history (stream=true for NDJSON)"""
+    history = session_manager.get_session_history(session_id)
+    first = await anext(history, None)
+    if first is None:
         raise HTTPException(status_code=404, detail="Session history not found")
+    history = _chain_first(first, history)
+    
+    if stream:
+        return StreamingResponse(stream_history(session_id, history), media_type="application/x-ndjson")
     
-    # Format history for easy reading
     formatted_history = []
-    for entry in history:
-        if entry.get('type') == 'user':
-            formatted_history.append({
-                "role": "user",
-                "content": entry['message']['content'],
-                "timestamp": entry['timestamp']
-            })
-        elif entry.get('type') == 'assistant':
-            message = entry.get('message', {})
-            content_items = message.get('content', [])
-            content_text = ""
-            tools_used = []
-            
-            for item in content_items:
-                if item.get('type') == 'text':
-                    content_text += item.get('text', '')
-                elif item.get('type') == 'tool_use':
-                    tools_used.append({
-                        "tool": item.get('name'),
-                        "input": item.get('input')
-                    })
-            
-            formatted_history.append({
-                "role": "assistant",
-                "content": content_text,
-                "tools_used": tools_used,
-                "timestamp": entry['timestamp']
-            })
+    async for entry in history:
+        formatted = format_history_entry(entry)
+        if formatted is not None:
+            formatted_history.append(formatted)
     
     return {
         "session_id": session_id,
@@ -273,11 +563,7 @@ async def send_message(session_id: str, request: MessageRequest):
     
     # Add participant info if shared session
     if session['shared'] and request.participant:
-        participant_exists = any(
-            p['name'] == request.participant 
-            for p in session['participants']
-        )
-        if not participant_exists:
+        if not session_manager.has_participant(session_id, request.participant):
             await session_manager.add_participant(session_id, request.participant)
     
     # Execute claude with session context
@@ -319,7 +605,8 @@ async def update_session(session_id: str, request: SessionUpdateRequest):
     if request.shared is not None:
         session['shared'] = request.shared
     
-    session_manager.save_metadata()
+    session_manager.reindex_session(session_id)
+    _dirty.set()
     return session
 
 
@@ -342,32 +629,10 @@ async def clone_session(session_id: str, new_name: str):
             "created_at": datetime.utcnow().isoformat(),
             "status": "pending"
         }
-        with open(transfer_file, 'w') as f:
-            json.dump(transfer_data, f, indent=2)
+        await _write_json(transfer_file, transfer_data)
         
         # Tell the original Claude to fork its knowledge
-        fork_prompt = f"""IMPORTANT: You need to fork your knowledge to a new session.
-
-A new session has been created as a fork of your current session. You need to transfer your knowledge to it.
-
-Please execute the following steps:
-1. Summarize everything important from our conversation
-2. Send this knowledge to the fork using this command:
-
-```bash
-curl -X POST http://localhost:8001/sessions/{new_session['id']}/receive-knowledge \\
-  -H "Content-Type: application/json" \\
-  -d '{{"from_session": "{session_id}", "knowledge": "<YOUR_SUMMARY_HERE>"}}'
-```
-
-Replace <YOUR_SUMMARY_HERE> with a comprehensive summary including:
-- All shared facts and context
-- Project state and decisions
-- Important files and their purposes
-- Current objectives and progress
-- Any other relevant information
-
-This will ensure your fork has all necessary context to continue the work."""
+        fork_prompt = _FORK_PROMPT_TMPL.format(new_session_id=new_session['id'], session_id=session_id)
         
         # Send fork instruction to original session
         fork_result = await execute_claude(
@@ -401,9 +666,8 @@ async def receive_knowledge(session_id: str, request: ReceiveKnowledgeRequest):
     
     # Check if this session is expecting a transfer
     transfer_file = workspace / ".session" / "awaiting_transfer.json"
-    if transfer_file.exists():
-        with open(transfer_file, 'r') as f:
-            transfer_data = json.load(f)
+    if await asyncio.to_thread(transfer_file.exists):
+        transfer_data = await _read_json(transfer_file)
         
         # Verify the transfer is from the expected parent
         if transfer_data["from_session_id"] != request.from_session:
@@ -412,21 +676,10 @@ async def receive_knowledge(session_id: str, request: ReceiveKnowledgeRequest):
         # Update transfer status
         transfer_data["status"] = "received"
         transfer_data["received_at"] = datetime.utcnow().isoformat()
-        with open(transfer_file, 'w') as f:
-            json.dump(transfer_data, f, indent=2)
+        await _write_json(transfer_file, transfer_data)
     
     # Initialize the fork with the transferred knowledge
-    init_prompt = f"""You are a fork of another Claude session. You have just received a knowledge transfer from your parent session.
-
----KNOWLEDGE TRANSFER FROM PARENT---
-{request.knowledge}
----END TRANSFER---
-
-Please:
-1. Acknowledge receipt of this knowledge
-2. Summarize what you now know
-3. Register your session ID as instructed in CLAUDE.md
-4. Indicate you're ready to continue the work"""
+    init_prompt = _INIT_PROMPT_TMPL.format(knowledge=request.knowledge)
     
     # Send to Claude in this session
     result = await execute_claude(
@@ -441,7 +694,7 @@ Please:
         session_manager.sessions[session_id]["knowledge_received"] = True
         session_manager.sessions[session_id]["parent_session"] = request.from_session
         session_manager.sessions[session_id]["knowledge_transfer"] = request.knowledge[:500] + "..." if len(request.knowledge) > 500 else request.knowledge
-        session_manager.save_metadata()
+        _dirty.set()
         
         return {
             "status": "success",
@@ -456,6 +709,11 @@ Please:
 async def archive_session(session_id: str):
     """Archive a session"""
     await session_manager.archive_session(session_id)
+    worker = workers.pop(session_id, None)
+    spawn_locks.pop(session_id, None)
+    if worker:
+        async with worker.lock:
+            await worker.close()
     return {"message": "Session archived", "session_id": session_id}
 
 
@@ -474,79 +732,118 @@ async def register_claude_session(session_id: str, request: RegisterClaudeSessio
     workspace = Path(session['workspace'])
     marker_path = workspace / request.marker_file
     
-    if not marker_path.exists():
+    if not await asyncio.to_thread(marker_path.exists):
         raise HTTPException(status_code=400, detail="Marker file not found")
     
-    # Find Claude's session ID from the project directory
-    claude_projects_dir = Path.home() / ".claude" / "projects"
-    workspace_name = str(workspace).replace("/tmp/", "/private/tmp/").replace("/", "-")
-    project_dir = claude_projects_dir / workspace_name
-    
-    if project_dir.exists():
-        # Get the most recent .jsonl file
-        jsonl_files = list(project_dir.glob("*.jsonl"))
-        if jsonl_files:
-            newest_file = max(jsonl_files, key=lambda p: p.stat().st_mtime)
-            claude_session_id = newest_file.stem
-            
-            # Update session with Claude session ID
-            session_manager.sessions[session_id]["claude_session_id"] = claude_session_id
-            session_manager.save_metadata()
-            
-            return {
-                "status": "success",
-                "message": "Claude session ID registered",
-                "claude_session_id": claude_session_id,
-                "api_session_id": session_id
-            }
+    # Find Claude's session ID from the most recent .jsonl file in the project directory
+    claude_session_id = await _find_newest_jsonl_async(session_manager.project_dir(session))
+    if claude_session_id:
+        # Update session with Claude session ID
+        session["claude_session_id"] = claude_session_id
+        _dirty.set()
+        
+        return {
+            "status": "success",
+            "message": "Claude session ID registered",
+            "claude_session_id": claude_session_id,
+            "api_session_id": session_id
+        }
     
     raise HTTPException(status_code=500, detail="Could not find Claude session")
 
 
+class Subscriber:
+    """A WebSocket client whose frames go through a bounded queue and its own writer task"""
+    
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+        self.writer = asyncio.create_task(self._write())
+    
+    async def _write(self):
+        while True:
+            frame = await self.queue.get()
+            try:
+                await self.websocket.send_text(frame)
+            except Exception:
+                return  # client is gone; offer() sees the finished writer from now on
+    
+    def offer(self, frame: str) -> bool:
+        """Queue a frame without waiting; False if the client is dead or too far behind"""
+        if self.writer.done():
+            return False
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+    
+    async def close(self, code: int = 1000):
+        self.writer.cancel()
+        try:
+            await self.writer
+        except asyncio.CancelledError:
+            pass
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+
 @app.websocket("/sessions/{session_id}/ws")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """WebSocket for real-time session updates"""
     await websocket.accept()
     
     # Add to active connections
-    if session_id not in active_connections:
-        active_connections[session_id] = []
-    active_connections[session_id].append(websocket)
+    subscriber = Subscriber(websocket)
+    active_connections[session_id].add(subscriber)
     
     try:
         # Send initial session info
         session = session_manager.sessions.get(session_id)
-        if session:
-            await websocket.send_json({
-                "type": "session_info",
-                "data": session
-            })
+        if session and not subscriber.offer(_dumps({
+            "type": "session_info",
+            "data": session
+        })):
+            return
         
         # Keep connection alive
         while True:
             data = await websocket.receive_text()
-            # Echo back or handle commands
-            await websocket.send_text(f"Echo: {data}")
+            # Echo back or handle commands; a client too far behind (or already
+            # dropped by a broadcast, whose writer is gone) is closed, not waited on
+            if not subscriber.offer(f"Echo: {data}"):
+                await subscriber.close(code=1013)
+                return
             
     except WebSocketDisconnect:
-        active_connections[session_id].remove(websocket)
-        if not active_connections[session_id]:
-            del active_connections[session_id]
+        pass
+    finally:
+        subscriber.writer.cancel()
+        connections = active_connections.get(session_id)
+        if connections is not None:
+            connections.discard(subscriber)
+            if not connections:
+                del active_connections[session_id]
 
 
 async def notify_session_update(session_id: str, data: dict):
     """Notify all WebSocket clients of session updates"""
-    if session_id in active_connections:
-        for connection in active_connections[session_id]:
-            try:
-                await connection.send_json({
-                    "type": "message",
-                    "data": data
-                })
-            except:
-                # Remove dead connections
-                active_connections[session_id].remove(connection)
+    connections = active_connections.get(session_id)
+    if connections:
+        # Encode once and hand the frame to each client's writer; clients
+        # whose queue is full are dropped instead of stalling everyone else
+        frame = _dumps({"type": "message", "data": data})
+        dropped = [subscriber for subscriber in connections if not subscriber.offer(frame)]
+        for subscriber in dropped:
+            connections.discard(subscriber)
+        if dropped:
+            # 1013: try again later
+            await asyncio.gather(*(subscriber.close(code=1013) for subscriber in dropped))
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # uvloop and httptools come with uvicorn[standard]. Sessions and claude
+    # workers live in this process, so it runs as a single worker.
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="uvloop", http="httptools")
\ No newline at end of file
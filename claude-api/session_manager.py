@@ -6,74 +6,235 @@ Handles persistent, shareable sessions with full history
 import json
 import os
 import asyncio
+from collections import defaultdict
+import heapq
+import itertools
+import mmap
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import AsyncIterator, DefaultDict, Dict, Iterator, List, Optional, Set, Tuple
 import uuid
 import shutil
+import threading
+import time
 
-class ClaudeSessionManager:
-    def __init__(self):
-        self.sessions_dir = Path("/tmp/claude-sessions")
-        self.sessions_dir.mkdir(exist_ok=True)
-        self.metadata_file = self.sessions_dir / "sessions.json"
-        self.load_metadata()
-    
-    def load_metadata(self):
-        """Load session metadata from disk"""
-        if self.metadata_file.exists():
-            with open(self.metadata_file, 'r') as f:
-                self.sessions = json.load(f)
-        else:
-            self.sessions = {}
-    
-    def save_metadata(self):
-        """Save session metadata to disk"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.sessions, f, indent=2)
-    
-    async def create_session(self, name: str, description: str = "", 
-                           shared: bool = False, tags: List[str] = None) -> Dict:
-        """Create a new persistent session"""
-        session_id = str(uuid.uuid4())
-        workspace = self.sessions_dir / session_id
-        workspace.mkdir(exist_ok=True)
-        
-        # Create session metadata
-        session_info = {
-            "id": session_id,
-            "name": name,
-            "description": description,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_accessed": datetime.utcnow().isoformat(),
-            "shared": shared,
-            "tags": tags or [],
-            "workspace": str(workspace),
-            "participants": [],
-            "claude_session_id": None,  # Will be populated after first Claude interaction
-            "message_count": 0,
-            "tool_usage": {},
-            "status": "active"
-        }
-        
-        self.sessions[session_id] = session_info
-        self.save_metadata()
-        
-        # Create CLAUDE.md with session context
-        await self.create_session_context(workspace, session_info)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HISTORY_READ_SIZE = 1 << 20  # bytes read per chunk when scanning transcripts
+HISTORY_BATCH_SIZE = 500  # history entries parsed per trip to the worker thread
+COPY_CHUNK_SIZE = 1 << 20  # read/write size when a kernel-side copy isn't available
+SESSION_LOG_COMPACT_RATIO = 4  # compact once the change log outgrows the snapshot this much
+SESSION_LOG_MIN_COMPACT = 1 << 16  # ...but not before it reaches this many bytes
+CLONE_COPY_STREAMS = 8  # worker-thread jobs a clone's file copies are spread across
+CLAUDE_PROJECTS_DIR = Path.home() / ".claude" / "projects"  # where the claude CLI keeps transcripts
+
+
+def _now_iso() -> str:
+    """Current UTC time in datetime.isoformat() layout, without building a datetime"""
+    t = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(t)) + f'.{int(t % 1 * 1e6):06d}'
+
+
+def jloads(data) -> object:
+    """Parse JSON from str or bytes, using orjson when it is installed"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def jdumps(obj, indent: bool = True) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def iter_jsonl(path: Path) -> Iterator[Dict]:
+    """Yield the entries of a JSONL file, splitting large reads on newlines"""
+    with open(path, 'rb') as f:
+        remainder = b''
+        while True:
+            chunk = f.read(HISTORY_READ_SIZE)
+            if not chunk:
+                break
+            buf = remainder + chunk if remainder else chunk
+            start = 0
+            end = buf.find(b'\n')
+            while end != -1:
+                if end > start and not buf[start:end].isspace():
+                    yield jloads(buf[start:end])
+                start = end + 1
+                end = buf.find(b'\n', start)
+            remainder = buf[start:]
+        if remainder.strip():
+            yield jloads(remainder)
+
+
+def history_key(entry: Dict) -> str:
+    """Sort key for transcript entries; those without a timestamp sort first"""
+    return entry.get('timestamp') or ''
+
+
+def write_files(files: List[Tuple[Path, str]]):
+    """Write (path, text) pairs, each with a single os.write"""
+    for path, text in files:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, text.encode())
+        finally:
+            os.close(fd)
+
+
+def take(iterator: Iterator, n: int) -> List:
+    return list(itertools.islice(iterator, n))
+
+
+def search_text(session: Dict) -> str:
+    """The lowercased text search_sessions matches queries against"""
+    return (session['name'] + ' ' + (session.get('description') or '')).lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def scan_transcript(path: Path, cursor: Optional[Dict] = None) -> Dict:
+    """Fold a transcript's new complete lines into its summary cursor.
+
+    The cursor records how far the file has been read along with the running
+    message count, tool usage and latest timestamp, and whether the entries so
+    far are in timestamp order. A replaced or truncated file is rescanned from
+    the start.
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if cursor is None or cursor["inode"] != st.st_ino or cursor["offset"] > st.st_size:
+            cursor = {"inode": st.st_ino, "offset": 0, "message_count": 0,
+                      "tool_uses": {}, "last_activity": None, "last_key": '', "ordered": True}
+        if st.st_size == cursor["offset"]:
+            return cursor
+        # Fold into a copy, so a scan running concurrently in another thread
+        # never sees (or double-counts into) a half-updated cursor
+        cursor = dict(cursor, tool_uses=dict(cursor["tool_uses"]))
         
-        return session_info
-    
-    async def create_session_context(self, workspace: Path, session_info: Dict):
-        """Create a rich CLAUDE.md with session context"""
-        claude_md = f"""# Session: {session_info['name']}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = cursor["offset"]
+            end = mm.find(b'\n', pos)
+            # Lines still being written (no newline yet) wait for the next scan
+            while end != -1:
+                line = mm[pos:end]
+                if line.strip():
+                    entry = jloads(line)
+                    key = history_key(entry)
+                    if key < cursor["last_key"]:
+                        cursor["ordered"] = False
+                    cursor["last_key"] = key
+                    if entry.get('timestamp'):
+                        cursor["last_activity"] = entry['timestamp']
+                    if entry.get('type') == 'user':
+                        cursor["message_count"] += 1
+                    elif entry.get('type') == 'assistant':
+                        message = entry.get('message', {})
+                        content = message.get('content', [])
+                        for item in content:
+                            if item.get('type') == 'tool_use':
+                                tool_name = item.get('name', 'unknown')
+                                cursor["tool_uses"][tool_name] = cursor["tool_uses"].get(tool_name, 0) + 1
+                pos = end + 1
+                end = mm.find(b'\n', pos)
+            cursor["offset"] = pos
+    return cursor
+
+
+def fast_copy(src: str, dst: str):
+    """Copy a file and its metadata, moving the bytes inside the kernel where possible"""
+    st = os.stat(src)
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, st.st_mode & 0o777)
+        try:
+            copied = 0
+            try:
+                # copy_file_range can reflink or copy server-side; sendfile still
+                # avoids the user-space round trip. Both advance dst's offset.
+                if hasattr(os, 'copy_file_range'):
+                    while copied < st.st_size:
+                        n = os.copy_file_range(src_fd, dst_fd, st.st_size - copied, copied)
+                        if n == 0:
+                            break
+                        copied += n
+                else:
+                    while copied < st.st_size:
+                        n = os.sendfile(dst_fd, src_fd, copied, st.st_size - copied)
+                        if n == 0:
+                            break
+                        copied += n
+            except OSError:
+                # Unsupported by this filesystem; finish with plain reads and writes
+                os.lseek(src_fd, copied, os.SEEK_SET)
+                os.lseek(dst_fd, copied, os.SEEK_SET)
+                while True:
+                    chunk = os.read(src_fd, COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    os.write(dst_fd, chunk)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(src, dst)
+
+
+def copy_files(files: List[Tuple[str, str]]):
+    """Copy each (src, dst) pair in turn"""
+    for src, dst in files:
+        fast_copy(src, dst)
+
+
+def collect_copies(src_dir: str, dst_dir: str, skip: Set[str] = frozenset(),
+                   dirs: Optional[List[Tuple[str, str]]] = None) -> List[Tuple[str, str]]:
+    """Mirror src_dir's directories and symlinks into dst_dir and return the (src, dst)
+    files to copy.
+
+    Symlinks are recreated rather than followed, so broken links survive and
+    linked directories can't loop. Each mirrored directory is appended to dirs
+    after everything inside it, ready for copy_dir_stats once the files land.
+    """
+    files = []
+    with os.scandir(src_dir) as entries:
+        for entry in entries:
+            if entry.name in skip:
+                continue
+            dst = os.path.join(dst_dir, entry.name)
+            if entry.is_symlink():
+                if os.path.lexists(dst):
+                    os.remove(dst)
+                os.symlink(os.readlink(entry.path), dst)
+            elif entry.is_dir(follow_symlinks=False):
+                os.makedirs(dst, exist_ok=True)
+                files.extend(collect_copies(entry.path, dst, dirs=dirs))
+                if dirs is not None:
+                    dirs.append((entry.path, dst))
+            elif entry.is_file(follow_symlinks=False):
+                files.append((entry.path, dst))
+    return files
+
+
+def copy_dir_stats(dirs: List[Tuple[str, str]]):
+    """Copy mode bits and timestamps onto mirrored directories, innermost first"""
+    for src, dst in dirs:
+        shutil.copystat(src, dst)
+
+
+# Session CLAUDE.md, filled in with str.format (literal braces are doubled)
+CLAUDE_MD_TEMPLATE = """# Session: {name}
 
 ## Session Information
-- **ID**: {session_info['id']}
-- **Created**: {session_info['created_at']}
-- **Description**: {session_info['description']}
-- **Tags**: {', '.join(session_info['tags'])}
-- **Shared**: {'Yes' if session_info['shared'] else 'No'}
+- **ID**: {id}
+- **Created**: {created_at}
+- **Description**: {description}
+- **Tags**: {tags}
+- **Shared**: {shared}
 
 ## CRITICAL: Register Your Session ID
 
@@ -83,7 +244,7 @@ As your FIRST action, please execute these commands to enable conversation memor
 echo "CLAUDE_SESSION_REGISTERED" > .session/registration_marker.txt
 
 # Send your session ID to the API
-curl -X POST http://localhost:8001/sessions/{session_info['id']}/register-claude-session \\
+curl -X POST http://localhost:8001/sessions/{id}/register-claude-session \\
   -H "Content-Type: application/json" \\
   -d '{{"marker_file": ".session/registration_marker.txt"}}'
 ```
@@ -119,42 +280,245 @@ When multiple participants are involved:
 - Maintain a decision log in .session/decisions.md
 - Track action items in .session/todos.md
 """
+
+
+class ClaudeSessionManager:
+    def __init__(self, sessions_dir: Path = Path("/tmp/claude-sessions")):
+        self.sessions_dir = Path(sessions_dir)
+        self.sessions_dir.mkdir(exist_ok=True)
+        self.metadata_file = self.sessions_dir / "sessions.json"
+        self._participant_names: Dict[str, Set[str]] = {}  # built lazily per session
+        self._summary_cursors: Dict[str, Dict[str, Dict]] = {}  # session -> file -> scan state
+        self._project_dirs: Dict[str, Path] = {}  # session -> Claude transcript dir
+        self._state_cache: Dict[str, Tuple[int, int, Dict]] = {}  # session -> (mtime_ns, size, state)
+        self._trigram_index: DefaultDict[str, Set[str]] = defaultdict(set)  # for search_sessions
+        self._tag_index: DefaultDict[str, Set[str]] = defaultdict(set)
+        self._indexed: Dict[str, Tuple[Set[str], Set[str]]] = {}  # what each session is filed under
+        self._save_lock = threading.Lock()  # snapshots may be written from a worker thread
+        self.load_metadata()
+    
+    def _log_path(self, generation: int) -> Path:
+        return self.sessions_dir / f"sessions.log.{generation}.jsonl"
+    
+    def _log_generations(self) -> List[int]:
+        generations = []
+        for path in self.sessions_dir.glob("sessions.log.*.jsonl"):
+            try:
+                generations.append(int(path.name.split(".")[2]))
+            except ValueError:
+                continue
+        return sorted(generations)
+    
+    def load_metadata(self):
+        """Load the session snapshot from disk and replay newer change logs over it"""
+        self.sessions = {}
+        snapshot_generation = 0
+        self._snapshot_size = 0
+        if self.metadata_file.exists():
+            with open(self.metadata_file, 'rb') as f:
+                raw = f.read()
+            data = jloads(raw)
+            self._snapshot_size = len(raw)
+            if "generation" in data and "sessions" in data:
+                snapshot_generation, self.sessions = data["generation"], data["sessions"]
+            else:
+                self.sessions = data  # plain snapshot from before the change log
         
-        (workspace / "CLAUDE.md").write_text(claude_md)
+        # Log N holds the changes made after snapshot N was taken
+        torn = False
+        self.generation = snapshot_generation
+        for generation in self._log_generations():
+            if generation < snapshot_generation:
+                continue
+            try:
+                for event in iter_jsonl(self._log_path(generation)):
+                    if event["op"] == "upsert":
+                        self.sessions[event["id"]] = event["session"]
+                    elif event["op"] == "delete":
+                        self.sessions.pop(event["id"], None)
+            except ValueError:
+                torn = True  # crashed mid-append; the rest of this log is unusable
+            self.generation = generation
         
-        # Create session subdirectories
-        (workspace / ".session").mkdir(exist_ok=True)
-        (workspace / ".session" / "state.json").write_text("{}")
-        (workspace / ".session" / "decisions.md").write_text(f"# Decisions Log - {session_info['name']}\n\n")
-        (workspace / ".session" / "todos.md").write_text(f"# Action Items - {session_info['name']}\n\n")
+        log_path = self._log_path(self.generation)
+        self._log_size = log_path.stat().st_size if log_path.exists() else 0
+        self._saved_generation = snapshot_generation
+        for session in self.sessions.values():
+            session.pop('_project_dir', None)  # cached on the session before it moved here
+        self._participant_names.clear()
+        self._project_dirs.clear()
+        self._indexed.clear()
+        self._trigram_index.clear()
+        self._tag_index.clear()
+        for session_id in self.sessions:
+            self.reindex_session(session_id)
+        if torn:
+            self.save_metadata()
+    
+    def _append_event(self, event: Dict):
+        """Durably append one change to the current log, compacting when it grows large"""
+        line = jdumps(event, indent=False) + b"\n"
+        with open(self._log_path(self.generation), 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_size += len(line)
+        if self._log_size > SESSION_LOG_COMPACT_RATIO * max(self._snapshot_size, SESSION_LOG_MIN_COMPACT):
+            self.compact()
+    
+    def _upsert(self, session_id: str):
+        self._append_event({"op": "upsert", "id": session_id, "session": self.sessions[session_id]})
+    
+    def dump_metadata(self) -> Tuple[int, bytes]:
+        """Serialize a snapshot of session metadata; later changes go to a new log"""
+        self.generation += 1
+        self._log_size = 0
+        data = jdumps({"generation": self.generation, "sessions": self.sessions})
+        self._snapshot_size = len(data)
+        return self.generation, data
     
-    async def get_session_history(self, session_id: str) -> List[Dict]:
-        """Get full conversation history from Claude's storage"""
+    def save_metadata(self, snapshot: Optional[Tuple[int, bytes]] = None):
+        """Atomically write a snapshot (a fresh one by default) and drop the logs it covers"""
+        if snapshot is None:
+            snapshot = self.dump_metadata()
+        generation, data = snapshot
+        with self._save_lock:
+            if generation < self._saved_generation:
+                return  # a newer snapshot is already on disk
+            tmp_file = self.metadata_file.with_suffix(".json.tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.metadata_file)
+            self._saved_generation = generation
+            for old in self._log_generations():
+                if old < generation:
+                    self._log_path(old).unlink(missing_ok=True)
+    
+    compact = save_metadata
+    
+    async def create_session(self, name: str, description: str = "", 
+                           shared: bool = False, tags: List[str] = None) -> Dict:
+        """Create a new persistent session"""
+        session_id = str(uuid.uuid4())
+        workspace = self.sessions_dir / session_id
+        workspace.mkdir(exist_ok=True)
+        
+        # Create session metadata
+        now = _now_iso()
+        session_info = {
+            "id": session_id,
+            "name": name,
+            "description": description,
+            "created_at": now,
+            "last_accessed": now,
+            "shared": shared,
+            "tags": tags or [],
+            "workspace": str(workspace),
+            "participants": [],
+            "claude_session_id": None,  # Will be populated after first Claude interaction
+            "message_count": 0,
+            "tool_usage": {},
+            "status": "active"
+        }
+        
+        # Index before logging, so a session that can't be indexed is never persisted
+        self.sessions[session_id] = session_info
+        try:
+            self.reindex_session(session_id)
+        except Exception:
+            del self.sessions[session_id]
+            raise
+        self._upsert(session_id)
+        
+        # Create CLAUDE.md with session context
+        await self.create_session_context(workspace, session_info)
+        
+        return session_info
+    
+    async def create_session_context(self, workspace: Path, session_info: Dict):
+        """Create a rich CLAUDE.md with session context"""
+        claude_md = CLAUDE_MD_TEMPLATE.format(
+            name=session_info['name'],
+            id=session_info['id'],
+            created_at=session_info['created_at'],
+            description=session_info['description'],
+            tags=', '.join(session_info['tags']),
+            shared='Yes' if session_info['shared'] else 'No'
+        )
+        
+        # Create session subdirectories, then write every file in one trip off the loop
+        session_dir = workspace / ".session"
+        session_dir.mkdir(exist_ok=True)
+        files = [
+            (workspace / "CLAUDE.md", claude_md),
+            (session_dir / "state.json", "{}"),
+            (session_dir / "decisions.md", f"# Decisions Log - {session_info['name']}\n\n"),
+            (session_dir / "todos.md", f"# Action Items - {session_info['name']}\n\n"),
+        ]
+        await asyncio.get_running_loop().run_in_executor(None, write_files, files)
+    
+    def project_dir(self, session: Dict) -> Path:
+        """Claude's transcript directory for a session's workspace, cached per session"""
+        project_dir = self._project_dirs.get(session['id'])
+        if project_dir is None:
+            escaped_workspace = session['workspace'].replace("/tmp/", "/private/tmp/").replace("/", "-")
+            project_dir = self._project_dirs[session['id']] = CLAUDE_PROJECTS_DIR / escaped_workspace
+        return project_dir
+    
+    async def get_session_history(self, session_id: str) -> AsyncIterator[Dict]:
+        """Yield the full conversation history from Claude's storage, oldest first"""
         session = self.sessions.get(session_id)
         if not session:
-            return []
+            return
         
         # Find Claude's session file
-        claude_projects_dir = Path.home() / ".claude" / "projects"
-        session_workspace = session['workspace'].replace("/tmp/", "/private/tmp/")
-        escaped_workspace = session_workspace.replace("/", "-")
-        
-        project_dir = claude_projects_dir / escaped_workspace
+        project_dir = self.project_dir(session)
         if not project_dir.exists():
-            return []
+            return
         
-        # Read all JSONL files
-        history = []
-        for jsonl_file in project_dir.glob("*.jsonl"):
-            with open(jsonl_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        entry = json.loads(line)
-                        history.append(entry)
+        # Transcripts are normally appended in timestamp order, so merging
+        # them keeps only one pending entry per file in memory
+        files = sorted(project_dir.glob("*.jsonl"))
+        loop = asyncio.get_running_loop()
+        streams = await loop.run_in_executor(None, self._history_streams, session_id, files)
+        merged = heapq.merge(*streams, key=history_key)
         
-        # Sort by timestamp
-        history.sort(key=lambda x: x.get('timestamp', ''))
-        return history
+        # Read, parse and merge in a worker thread a batch at a time, so large
+        # transcripts don't stall the event loop
+        while True:
+            batch = await loop.run_in_executor(None, take, merged, HISTORY_BATCH_SIZE)
+            if not batch:
+                return
+            for entry in batch:
+                yield entry
+    
+    def _history_streams(self, session_id: str, files: List[Path]) -> List[Iterator[Dict]]:
+        """One timestamp-ordered entry stream per transcript, for merging.
+
+        The summary cursors already record whether each file is in order;
+        the rare file that isn't is sorted in memory instead of streamed.
+        """
+        cursors = self._summary_cursors.setdefault(session_id, {})
+        streams = []
+        for path in files:
+            cursor = scan_transcript(path, cursors.get(path.name))
+            cursors[path.name] = cursor
+            if cursor["ordered"]:
+                streams.append(iter_jsonl(path))
+            else:
+                streams.append(iter(sorted(iter_jsonl(path), key=history_key)))
+        return streams
+    
+    def has_participant(self, session_id: str, participant: str) -> bool:
+        """Check whether a participant has already joined a session"""
+        names = self._participant_names.get(session_id)
+        if names is None:
+            session = self.sessions.get(session_id, {})
+            names = {p['name'] for p in session.get('participants', [])}
+            self._participant_names[session_id] = names
+        return participant in names
     
     async def add_participant(self, session_id: str, participant: str, role: str = "contributor"):
         """Add a participant to a shared session"""
@@ -162,9 +526,12 @@ When multiple participants are involved:
             self.sessions[session_id]["participants"].append({
                 "name": participant,
                 "role": role,
-                "joined_at": datetime.utcnow().isoformat()
+                "joined_at": _now_iso()
             })
-            self.save_metadata()
+            names = self._participant_names.get(session_id)
+            if names is not None:
+                names.add(participant)
+            self._upsert(session_id)
     
     async def get_session_summary(self, session_id: str) -> Dict:
         """Get a summary of session activity"""
@@ -172,36 +539,55 @@ When multiple participants are involved:
         if not session:
             return None
         
-        history = await self.get_session_history(session_id)
-        
-        # Analyze history
-        message_count = len([h for h in history if h.get('type') == 'user'])
-        tool_uses = {}
-        
-        for entry in history:
-            if entry.get('type') == 'assistant':
-                message = entry.get('message', {})
-                content = message.get('content', [])
-                for item in content:
-                    if item.get('type') == 'tool_use':
-                        tool_name = item.get('name', 'unknown')
-                        tool_uses[tool_name] = tool_uses.get(tool_name, 0) + 1
-        
-        # Read session state
-        state_file = Path(session['workspace']) / ".session" / "state.json"
-        state = {}
-        if state_file.exists():
-            with open(state_file, 'r') as f:
-                state = json.load(f)
+        # Analyze history in a worker thread, parsing only what each transcript
+        # gained since last time
+        loop = asyncio.get_running_loop()
+        message_count, tool_uses, last_activity = await loop.run_in_executor(
+            None, self._scan_transcripts, session_id, self.project_dir(session))
+        state = await loop.run_in_executor(None, self._load_state, session_id, session)
         
         return {
             "session": session,
             "message_count": message_count,
             "tool_usage": tool_uses,
             "state": state,
-            "last_activity": history[-1].get('timestamp') if history else None
+            "last_activity": last_activity
         }
     
+    def _scan_transcripts(self, session_id: str, project_dir: Path) -> Tuple[int, Dict[str, int], Optional[str]]:
+        """Total message count, tool usage and latest timestamp across a session's transcripts"""
+        message_count = 0
+        tool_uses = {}
+        last_activity = None
+        
+        cursors = self._summary_cursors.setdefault(session_id, {})
+        if project_dir.exists():
+            for path in project_dir.glob("*.jsonl"):
+                cursor = scan_transcript(path, cursors.get(path.name))
+                cursors[path.name] = cursor
+                message_count += cursor["message_count"]
+                for tool_name, count in cursor["tool_uses"].items():
+                    tool_uses[tool_name] = tool_uses.get(tool_name, 0) + count
+                if cursor["last_activity"] and (last_activity is None or cursor["last_activity"] > last_activity):
+                    last_activity = cursor["last_activity"]
+        return message_count, tool_uses, last_activity
+    
+    def _load_state(self, session_id: str, session: Dict) -> Dict:
+        """Read a session's state.json, reparsing only when its mtime or size changes"""
+        state_file = Path(session['workspace']) / ".session" / "state.json"
+        try:
+            with open(state_file, 'rb') as f:
+                st = os.fstat(f.fileno())
+                cached = self._state_cache.get(session_id)
+                if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+                    return cached[2]
+                state = jloads(f.read())
+        except FileNotFoundError:
+            self._state_cache.pop(session_id, None)
+            return {}
+        self._state_cache[session_id] = (st.st_mtime_ns, st.st_size, state)
+        return state
+    
     async def clone_session(self, session_id: str, new_name: str) -> Dict:
         """Clone an existing session with its full state"""
         original = self.sessions.get(session_id)
@@ -220,17 +606,23 @@ When multiple participants are involved:
         if original.get('claude_session_id'):
             new_session['claude_session_id'] = original['claude_session_id']
             self.sessions[new_session['id']] = new_session
-            self.save_metadata()
+            self._upsert(new_session['id'])
         
         # Copy workspace contents
         original_workspace = Path(original['workspace'])
         new_workspace = Path(new_session['workspace'])
         
-        for item in original_workspace.iterdir():
-            if item.is_file():
-                shutil.copy2(item, new_workspace / item.name)
-            elif item.is_dir() and item.name != '.claude':
-                shutil.copytree(item, new_workspace / item.name, dirs_exist_ok=True)
+        # Walk the tree and create directories in a worker thread, then copy files
+        # off the loop in a few interleaved runs, so thousands of small files
+        # don't each need a trip
+        loop = asyncio.get_running_loop()
+        dirs = []
+        files = await loop.run_in_executor(None, collect_copies, str(original_workspace),
+                                           str(new_workspace), {'.claude'}, dirs)
+        await asyncio.gather(*(loop.run_in_executor(None, copy_files, files[i::CLONE_COPY_STREAMS])
+                               for i in range(min(CLONE_COPY_STREAMS, len(files)))))
+        # Copying a file bumps its directory's mtime, so directory stats go last
+        await loop.run_in_executor(None, copy_dir_stats, dirs)
         
         return new_session
     
@@ -238,22 +630,49 @@ When multiple participants are involved:
         """Archive a session (mark as inactive but preserve)"""
         if session_id in self.sessions:
             self.sessions[session_id]["status"] = "archived"
-            self.sessions[session_id]["archived_at"] = datetime.utcnow().isoformat()
-            self.save_metadata()
+            self.sessions[session_id]["archived_at"] = _now_iso()
+            self._project_dirs.pop(session_id, None)
+            self._upsert(session_id)
     
     def list_active_sessions(self) -> List[Dict]:
         """List all active sessions"""
         return [s for s in self.sessions.values() if s['status'] == 'active']
     
+    def reindex_session(self, session_id: str):
+        """Refresh the search index after a session's name, description or tags change"""
+        old = self._indexed.pop(session_id, None)
+        if old:
+            for gram in old[0]:
+                self._trigram_index[gram].discard(session_id)
+            for tag in old[1]:
+                self._tag_index[tag].discard(session_id)
+        
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+        grams = trigrams(search_text(session))
+        tags = set(session['tags'])
+        self._indexed[session_id] = (grams, tags)
+        for gram in grams:
+            self._trigram_index[gram].add(session_id)
+        for tag in tags:
+            self._tag_index[tag].add(session_id)
+    
     def search_sessions(self, query: str = None, tags: List[str] = None) -> List[Dict]:
         """Search sessions by name, description, or tags"""
-        results = []
-        for session in self.sessions.values():
-            if query and query.lower() in (session['name'] + ' ' + session['description']).lower():
-                results.append(session)
-            elif tags and any(tag in session['tags'] for tag in tags):
-                results.append(session)
-        return results
+        matches = set()
+        if query:
+            query = query.lower()
+            candidates = self.sessions.keys()
+            if len(query) >= 3:
+                # Only sessions containing every trigram of the query can match
+                postings = sorted((self._trigram_index.get(gram, set()) for gram in trigrams(query)), key=len)
+                candidates = set.intersection(*postings)
+            matches.update(sid for sid in candidates if query in search_text(self.sessions[sid]))
+        if tags:
+            for tag in tags:
+                matches.update(self._tag_index.get(tag, ()))
+        return sorted((self.sessions[sid] for sid in matches), key=lambda s: s['created_at'])
 
 
 # Example usage
@@ -8,12 +8,15 @@ import time
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive connection for every request to the API
+SESSION = requests.Session()
+
 def test_api():
     print("🚀 Testing Claude API...")
     
     # 1. Create a session with initial prompt
     print("\n1️⃣ Creating session...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/sessions",
         json={
             "initial_prompt": "Hello! I'm testing the Claude API. Can you confirm you're working?",
@@ -28,7 +31,7 @@ def test_api():
     # 2. Send a follow-up message
     print("\n2️⃣ Sending follow-up message...")
     time.sleep(1)  # Small delay
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/sessions/{session_id}/messages",
         json={"prompt": "Can you remember what I just said? What was my first message about?"}
     )
@@ -37,20 +40,20 @@ def test_api():
     
     # 3. List all sessions
     print("\n3️⃣ Listing sessions...")
-    response = requests.get(f"{BASE_URL}/sessions")
+    response = SESSION.get(f"{BASE_URL}/sessions")
     sessions = response.json()
     print(f"✅ Found {sessions['count']} sessions")
     
     # 4. Get specific session info
     print("\n4️⃣ Getting session info...")
-    response = requests.get(f"{BASE_URL}/sessions/{session_id}")
+    response = SESSION.get(f"{BASE_URL}/sessions/{session_id}")
     session_info = response.json()
     print(f"✅ Session name: {session_info['name']}")
     print(f"   Created: {session_info['created_at']}")
     
     # 5. Clean up
     print("\n5️⃣ Cleaning up...")
-    response = requests.delete(f"{BASE_URL}/sessions/{session_id}")
+    response = SESSION.delete(f"{BASE_URL}/sessions/{session_id}")
     print("✅ Session deleted")
     
     print("\n✨ All tests passed!")
@@ -73,7 +76,7 @@ def interactive_test():
             break
         elif prompt.lower() == 'new':
             # Create new session
-            response = requests.post(f"{BASE_URL}/sessions", json={})
+            response = SESSION.post(f"{BASE_URL}/sessions", json={})
             session_id = response.json()["session"]["id"]
             print(f"Created new session: {session_id}")
             continue
@@ -82,7 +85,7 @@ def interactive_test():
             continue
         
         # Send message
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/sessions/{session_id}/messages",
             json={"prompt": prompt}
         )
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Tests for the session manager's metadata store."""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import session_manager
+from session_manager import ClaudeSessionManager
+
+
+class TestSessionMetadata(unittest.TestCase):
+    """Test cases for creating sessions and reloading them from disk."""
+    
+    def setUp(self):
+        """Set up a fresh data directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.sessions_dir = Path(self.temp_dir) / 'sessions'
+    
+    def tearDown(self):
+        """Clean up the data directory."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_null_description_survives_reload(self):
+        """Test that a session created without a description can be reloaded and searched."""
+        manager = ClaudeSessionManager(self.sessions_dir)
+        session = asyncio.run(manager.create_session("Notes", description=None))
+        
+        reloaded = ClaudeSessionManager(self.sessions_dir)
+        
+        self.assertIn(session['id'], reloaded.sessions)
+        results = reloaded.search_sessions(query="notes")
+        self.assertEqual([s['id'] for s in results], [session['id']])
+
+
+
+class TestSessionHistory(unittest.TestCase):
+    """Test cases for merging a session's transcripts into one history."""
+    
+    def setUp(self):
+        """Set up a fresh data directory and Claude projects directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = mock.patch.object(session_manager, 'CLAUDE_PROJECTS_DIR', Path(self.temp_dir) / 'projects')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = ClaudeSessionManager(Path(self.temp_dir) / 'sessions')
+        self.manager.sessions['s1'] = {'id': 's1', 'workspace': str(Path(self.temp_dir) / 'workspace')}
+        self.project_dir = self.manager.project_dir(self.manager.sessions['s1'])
+        self.project_dir.mkdir(parents=True)
+    
+    def tearDown(self):
+        """Clean up the data directory."""
+        shutil.rmtree(self.temp_dir)
+    
+    def write_transcript(self, name, entries):
+        """Write entries to a transcript file as JSONL."""
+        lines = [json.dumps(entry) + '\n' for entry in entries]
+        (self.project_dir / name).write_text(''.join(lines))
+    
+    def history(self):
+        """Collect the session's merged history."""
+        async def collect():
+            return [entry async for entry in self.manager.get_session_history('s1')]
+        return asyncio.run(collect())
+    
+    def test_out_of_order_transcript_is_sorted(self):
+        """Test that a transcript not in timestamp order still merges like a full sort."""
+        self.write_transcript('a.jsonl', [{'n': 1, 'timestamp': '2'}, {'n': 2}, {'n': 3, 'timestamp': '1'}])
+        self.write_transcript('b.jsonl', [{'n': 4, 'timestamp': '0'}, {'n': 5, 'timestamp': '3'}])
+        
+        self.assertEqual([entry['n'] for entry in self.history()], [2, 4, 3, 1, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,29 @@
 """Google Maps CLI Tool - Working Version using subprocess"""
 
 import argparse
+import hashlib
+import http.client
 import json
 import os
+import ssl
+import sqlite3
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def jloads(data):
+    """Parse JSON from str or bytes, using orjson when it is installed"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
 
 def load_api_key():
     """Load API key from environment or config file"""
@@ -17,8 +34,8 @@ def load_api_key():
     
     config_path = Path.home() / '.google-maps' / 'config.json'
     if config_path.exists():
-        with open(config_path) as f:
-            config = json.load(f)
+        with open(config_path, 'rb') as f:
+            config = jloads(f.read())
             api_key = config.get('api_key')
             if api_key:
                 return api_key
@@ -27,26 +44,183 @@ def load_api_key():
     sys.exit(1)
 
 
+API_HOST = "maps.googleapis.com"
+
+DETAIL_FIELDS = "formatted_phone_number,website,opening_hours"  # fetched by --details
+
+# Distance Matrix request limits: 25 origins, 25 destinations, 100 elements
+MATRIX_MAX_SIDE = 25
+MATRIX_MAX_ELEMENTS = 100
+
+# Kept open between requests so chained calls (geocode, then search) share one
+# TLS handshake. One per thread, since --details fetches concurrently.
+_local = threading.local()
+_use_curl = False  # set once Python's TLS verification has failed
+
+
+def _fetch_with_curl(path):
+    # Keep stdout as bytes; jloads parses them without a decode step
+    result = subprocess.run(['curl', '-s', f"https://{API_HOST}{path}"], capture_output=True)
+    if result.returncode != 0:
+        raise Exception(f"Request failed: {result.stderr.decode(errors='replace')}")
+    return result.stdout
+
+
+def _fetch(path):
+    """GET path over the shared keep-alive connection, falling back to curl"""
+    global _use_curl
+    if _use_curl:
+        return _fetch_with_curl(path)
+    
+    for attempt in range(2):
+        connection = getattr(_local, 'connection', None)
+        if connection is None:
+            connection = _local.connection = http.client.HTTPSConnection(API_HOST, timeout=30)
+        try:
+            connection.request('GET', path)
+            return connection.getresponse().read()
+        except ssl.SSLCertVerificationError:
+            # Python can't verify the certificate here (no trust store), but curl can
+            connection.close()
+            _local.connection = None
+            _use_curl = True
+            return _fetch_with_curl(path)
+        except (http.client.HTTPException, ConnectionError):
+            # Server closed the idle connection; reconnect once
+            connection.close()
+            _local.connection = None
+            if attempt:
+                raise
+
+
+CACHE_PATH = Path.home() / '.google-maps' / 'cache.sqlite'
+CACHE_TTLS = {  # seconds; endpoints not listed here are never cached
+    'geocode': 30 * 86400,
+    'place/details': 7 * 86400,
+}
+
+_cache = None  # sqlite connection, opened on first use; False if unavailable
+_cache_lock = threading.Lock()
+_cache_enabled = True  # turned off by --no-cache
+
+
+def _open_cache():
+    global _cache
+    if _cache is None:
+        try:
+            CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _cache = sqlite3.connect(CACHE_PATH, timeout=5, check_same_thread=False)
+            _cache.execute("PRAGMA journal_mode=WAL")  # concurrent CLI runs don't block readers
+            _cache.execute("CREATE TABLE IF NOT EXISTS cache "
+                           "(key TEXT PRIMARY KEY, expires_at INTEGER, body BLOB)")
+        except sqlite3.Error:
+            _cache = False
+    return _cache
+
+
+def cache_get(key):
+    """Return a cached response body, or None if missing or expired"""
+    with _cache_lock:
+        db = _open_cache()
+        if not db:
+            return None
+        try:
+            row = db.execute("SELECT body FROM cache WHERE key = ? AND expires_at > ?",
+                             (key, int(time.time()))).fetchone()
+        except sqlite3.Error:
+            return None
+    return row[0] if row else None
+
+
+def cache_put(key, body, ttl):
+    """Store a response body and drop expired entries"""
+    with _cache_lock:
+        db = _open_cache()
+        if not db:
+            return
+        now = int(time.time())
+        try:
+            with db:
+                db.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?)", (key, now + ttl, body))
+                db.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        except sqlite3.Error:
+            pass
+
+
 def make_request(endpoint, params):
-    """Make API request using curl"""
+    """Make API request over a reused HTTPS connection, via the on-disk cache"""
     api_key = load_api_key()
-    params['key'] = api_key
     
     # Build query string with proper encoding
     import urllib.parse
     query_string = urllib.parse.urlencode(params)
-    url = f"https://maps.googleapis.com/maps/api/{endpoint}/json?{query_string}"
     
-    # Use curl to make the request
-    result = subprocess.run(['curl', '-s', url], capture_output=True, text=True)
-    if result.returncode != 0:
-        raise Exception(f"Request failed: {result.stderr}")
+    # The cache key leaves out the API key
+    ttl = CACHE_TTLS.get(endpoint) if _cache_enabled else None
+    if ttl:
+        cache_key = hashlib.blake2b(f"{endpoint}?{query_string}".encode()).hexdigest()
+        body = cache_get(cache_key)
+        if body is not None:
+            return jloads(body)
+    
+    query_string += '&' + urllib.parse.urlencode({'key': api_key})
+    body = _fetch(f"/maps/api/{endpoint}/json?{query_string}")
+    data = jloads(body)
+    if ttl and data.get('status') == 'OK':
+        cache_put(cache_key, body, ttl)
+    return data
+
+
+def fetch_details(place):
+    """Fetch the --details fields for a search result ({} if unavailable)"""
+    data = make_request('place/details', {'place_id': place['place_id'], 'fields': DETAIL_FIELDS})
+    return data.get('result', {}) if data.get('status') == 'OK' else {}
+
+
+def read_lines(path):
+    """Non-blank lines of a file, stripped"""
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def distance_tiles(origins, destinations):
+    """Split an origins x destinations matrix into (row, col, origins, destinations) tiles
+    that each fit in one Distance Matrix request"""
+    cols = min(len(destinations), MATRIX_MAX_SIDE)
+    rows = min(len(origins), MATRIX_MAX_SIDE, MATRIX_MAX_ELEMENTS // cols)
+    return [(r, c, origins[r:r + rows], destinations[c:c + cols])
+            for r in range(0, len(origins), rows)
+            for c in range(0, len(destinations), cols)]
+
+
+def distance_matrix(origins, destinations, mode, units):
+    """Distance Matrix elements for every origin/destination pair, fetched tile by tile"""
+    def fetch_tile(tile):
+        row, col, tile_origins, tile_destinations = tile
+        data = make_request('distancematrix', {
+            'origins': '|'.join(tile_origins),
+            'destinations': '|'.join(tile_destinations),
+            'mode': mode,
+            'units': units,
+        })
+        if data.get('status') != 'OK':
+            raise Exception(f"Distance lookup failed: {data.get('status')}")
+        return row, col, data['rows']
     
-    return json.loads(result.stdout)
+    matrix = [[None] * len(destinations) for _ in origins]
+    tiles = distance_tiles(origins, destinations)
+    # Tiles are independent, so overlap their round trips
+    with ThreadPoolExecutor(max_workers=min(len(tiles), 8)) as pool:
+        for row, col, tile_rows in pool.map(fetch_tile, tiles):
+            for i, tile_row in enumerate(tile_rows):
+                matrix[row + i][col:col + len(tile_row['elements'])] = tile_row['elements']
+    return matrix
 
 
 def main():
     parser = argparse.ArgumentParser(description='Google Maps CLI')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Bypass the response cache in {CACHE_PATH}')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
     # Place search command
@@ -54,9 +228,26 @@ def main():
     search_parser.add_argument('query', help='Search query')
     search_parser.add_argument('--near', help='Location to search near')
     search_parser.add_argument('--limit', type=int, default=5, help='Max results')
+    search_parser.add_argument('--details', action='store_true',
+                               help='Also show phone, website and opening status')
+    
+    # Batch distance command
+    batch_parser = subparsers.add_parser('distance-batch',
+                                         help='Distances between every origin and destination')
+    batch_parser.add_argument('--origins-file', required=True, help='File with one origin per line')
+    batch_parser.add_argument('--destinations-file', required=True,
+                              help='File with one destination per line')
+    batch_parser.add_argument('--mode', default='driving',
+                              choices=['driving', 'walking', 'bicycling', 'transit'],
+                              help='Travel mode')
+    batch_parser.add_argument('--units', default='metric', choices=['metric', 'imperial'],
+                              help='Unit system')
     
     args = parser.parse_args()
     
+    global _cache_enabled
+    _cache_enabled = not args.no_cache
+    
     if not args.command:
         parser.print_help()
         sys.exit(1)
@@ -85,16 +276,46 @@ def main():
             
             if data['status'] == 'OK':
                 results = data['results'][:args.limit]
-                for i, place in enumerate(results, 1):
+                
+                # Detail lookups are independent, so overlap their round trips
+                details = [{}] * len(results)
+                if args.details and results:
+                    with ThreadPoolExecutor(max_workers=len(results)) as pool:
+                        details = list(pool.map(fetch_details, results))
+                
+                for i, (place, extra) in enumerate(zip(results, details), 1):
                     print(f"{i}. {place['name']}")
                     print(f"   Address: {place.get('formatted_address', 'N/A')}")
                     if 'rating' in place:
                         print(f"   Rating: {place['rating']} ⭐")
                     if 'price_level' in place:
                         print(f"   Price: {'$' * place['price_level']}")
+                    if 'formatted_phone_number' in extra:
+                        print(f"   Phone: {extra['formatted_phone_number']}")
+                    if 'website' in extra:
+                        print(f"   Website: {extra['website']}")
+                    if 'open_now' in extra.get('opening_hours', {}):
+                        print(f"   Open now: {'Yes' if extra['opening_hours']['open_now'] else 'No'}")
                     print()
             else:
                 print(f"No results found: {data.get('status')}")
+        
+        elif args.command == 'distance-batch':
+            origins = read_lines(args.origins_file)
+            destinations = read_lines(args.destinations_file)
+            if not origins or not destinations:
+                raise Exception("Need at least one origin and one destination")
+            
+            matrix = distance_matrix(origins, destinations, args.mode, args.units)
+            for origin, elements in zip(origins, matrix):
+                print(f"From: {origin}")
+                for destination, element in zip(destinations, elements):
+                    if element and element.get('status') == 'OK':
+                        print(f"   {destination}: {element['distance']['text']}, "
+                              f"{element['duration']['text']}")
+                    else:
+                        print(f"   {destination}: {element.get('status') if element else 'N/A'}")
+                print()
     
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
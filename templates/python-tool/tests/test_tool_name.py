@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Tests for command-line parsing and batch mode."""
+
+import importlib.util
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TOOL_PATH = Path(__file__).resolve().parent.parent / 'tool-name.py'
+
+
+def load_tool():
+    """Import tool-name.py, whose name isn't a valid module name."""
+    spec = importlib.util.spec_from_file_location('tool_name', TOOL_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestArgumentParsing(unittest.TestCase):
+    """Test that the argv fast path agrees with argparse."""
+    
+    def setUp(self):
+        """Load a fresh copy of the tool."""
+        self.tool = load_tool()
+    
+    def assert_same_parse(self, argv):
+        """Assert both parsers produce the same attributes for argv."""
+        fast = self.tool.scan_args(argv)
+        self.assertIsNotNone(fast, f"fast path deferred on {argv}")
+        self.assertEqual(vars(fast), vars(self.tool.build_parser().parse_args(argv)), argv)
+    
+    def sample_argvs(self):
+        """One command line per way of passing each declared argument."""
+        argvs = [[]]
+        for names, spec in self.tool.ARGUMENTS:
+            action = spec.get('action', 'store')
+            if action in ('help', 'version'):
+                continue
+            if not names[0].startswith('-'):
+                argvs.append(['data.txt'])
+            elif action.startswith('store_'):
+                argvs.extend([name] for name in names)
+            else:
+                value = str(spec['choices'][0]) if 'choices' in spec else '1'
+                argvs.extend([name, value] for name in names)
+                argvs.extend([f'{name}={value}'] for name in names if name.startswith('--'))
+        return argvs
+    
+    def test_every_argument_matches_argparse(self):
+        """Test each declared argument on its own and all of them together."""
+        argvs = self.sample_argvs()
+        for argv in argvs:
+            self.assert_same_parse(argv)
+        self.assert_same_parse([token for argv in argvs for token in argv if token != 'data.txt'] + ['data.txt'])
+    
+    def test_added_argument_with_default(self):
+        """Test that a newly declared argument gets its default and type on the fast path."""
+        self.tool.ARGUMENTS.append((('--limit',), {'type': int, 'default': '10'}))
+        self.tool.ARGUMENTS.append((('--format',), {'choices': ['text', 'csv'], 'default': 'text'}))
+        self.assert_same_parse(['data.txt'])
+        self.assert_same_parse(['--limit', '3', '--format=csv'])
+        self.assertIsNone(self.tool.scan_args(['--limit', 'many']))
+        self.assertIsNone(self.tool.scan_args(['--format', 'xml']))
+    
+    def test_unknown_tokens_defer_to_argparse(self):
+        """Test that anything the fast path doesn't know is left to argparse."""
+        for argv in (['--help'], ['--version'], ['-vo', 'out.txt'], ['a.txt', 'b.txt'],
+                     ['--outp', 'x'], ['-o'], ['-o', '--json'], ['--', 'x'], ['--json=1']):
+            self.assertIsNone(self.tool.scan_args(argv), argv)
+
+
+
+class TestServe(unittest.TestCase):
+    """Test running one command line per stdin line."""
+    
+    def setUp(self):
+        """Load a fresh copy of the tool and make an output directory."""
+        self.tool = load_tool()
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        """Clean up the output directory."""
+        shutil.rmtree(self.temp_dir)
+    
+    def serve(self, *lines):
+        """Run serve() over lines, with stderr captured."""
+        stdin = io.StringIO(''.join(line + '\n' for line in lines))
+        with mock.patch('sys.stdin', stdin), mock.patch('sys.stderr', io.StringIO()):
+            return self.tool.serve()
+    
+    def test_failed_line_sets_status_and_later_lines_run(self):
+        """Test that a failing line makes the exit code non-zero without stopping the rest."""
+        status = self.serve(f'missing.json -o {self.temp_dir / "a"}', f'b.txt -o {self.temp_dir / "b"}')
+        
+        self.assertEqual(status, 1)
+        self.assertTrue((self.temp_dir / 'b').exists())
+    
+    def test_exception_in_run_is_reported(self):
+        """Test that an exception escaping run() fails only its own line."""
+        run = self.tool.run
+        calls = []
+        
+        def flaky_run(args):
+            calls.append(args.input)
+            if args.input == 'bad.txt':
+                raise RuntimeError('boom')
+            return run(args)
+        
+        self.tool.run = flaky_run
+        status = self.serve(f'bad.txt -o {self.temp_dir / "a"}', f'good.txt -o {self.temp_dir / "b"}')
+        
+        self.assertEqual(status, 1)
+        self.assertEqual(calls, ['bad.txt', 'good.txt'])
+    
+    def test_all_lines_succeed(self):
+        """Test that the exit code is 0 when every line succeeds."""
+        self.assertEqual(self.serve('', f'a.txt -o {self.temp_dir / "a"}'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,12 +5,168 @@ Tool Name - Brief description
 This tool does X, Y, and Z.
 """
 
-import argparse
-import json
+from __future__ import annotations  # annotations stay unevaluated, so typing is never imported
+
+import os
 import sys
-from typing import Dict, Any
 
-def main():
+# argparse, json and orjson are imported where they are used, so runs that
+# never need them (plain output, the argv fast path) skip their load time
+
+def load_json(path: str) -> object:
+    """Parse a JSON file, using orjson over a memory map when it is installed."""
+    with open(path, 'rb') as f:
+        try:
+            import orjson
+        except ImportError:
+            import json
+            return json.loads(f.read())
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b'')  # empty files can't be mapped; report them the same way
+        
+        # Parse straight from the page cache instead of copying the file into bytes
+        import mmap
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+def dump_json(result: dict) -> bytes:
+    """Serialize results as indented JSON bytes, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+        return json.dumps(result, indent=2).encode()
+    return orjson.dumps(result, option=orjson.OPT_INDENT_2)
+
+def write_all(fd: int, data: bytes) -> None:
+    """Write bytes straight to a file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+# Every argument, declared once: build_parser() hands these to argparse and
+# scan_args() derives its fast path (names, defaults, types) from the same table
+ARGUMENTS = [
+    # Positional arguments
+    (('input',), {'nargs': '?', 'help': 'Input file or data'}),
+    
+    # Optional arguments
+    (('-o', '--output'), {'help': 'Output file (default: stdout)'}),
+    (('--json',), {'action': 'store_true', 'help': 'Output as JSON'}),
+    (('-v', '--verbose'), {'action': 'store_true', 'help': 'Verbose output'}),
+    (('--serve',), {'action': 'store_true',
+                    'help': 'Read one command line per stdin line and run each in this process'}),
+    (('--version',), {'action': 'version', 'version': '%(prog)s 1.0.0'}),
+]
+
+class Args:
+    """The parsed command line, shaped like argparse's Namespace."""
+
+def _dest(names: tuple, spec: dict) -> str:
+    """The attribute argparse stores an argument under."""
+    if 'dest' in spec:
+        return spec['dest']
+    if not names[0].startswith('-'):
+        return names[0]
+    name = next((n for n in names if n.startswith('--')), names[0])
+    return name.lstrip('-').replace('-', '_')
+
+def _fast_path_tables() -> tuple:
+    """Split ARGUMENTS into what scan_args handles itself: (defaults, flags, options,
+    positionals, required). Tokens for any other argument are left to argparse."""
+    defaults, flags, options, positionals, required = {}, {}, {}, [], set()
+    for names, spec in ARGUMENTS:
+        action = spec.get('action', 'store')
+        if action in ('help', 'version'):
+            continue
+        dest = _dest(names, spec)
+        default = spec.get('default', {'store_true': False, 'store_false': True}.get(action))
+        if isinstance(default, str) and 'type' in spec:
+            default = spec['type'](default)  # argparse converts string defaults too
+        defaults[dest] = default
+        if spec.get('required') or (not names[0].startswith('-') and 'nargs' not in spec):
+            required.add(dest)
+        if not names[0].startswith('-'):
+            # Variable-length positionals need argparse's matching
+            positionals.append((dest, spec) if spec.get('nargs') in (None, '?') else None)
+        elif action in ('store_true', 'store_false'):
+            flags.update((name, (dest, action == 'store_true')) for name in names)
+        elif action == 'store' and spec.get('nargs') is None:
+            options.update((name, (dest, spec)) for name in names)
+    return defaults, flags, options, positionals, required
+
+def _convert(spec: dict, value: str):
+    """Apply an argument's type and choices, raising ValueError if argparse would reject it."""
+    if 'type' in spec:
+        try:
+            value = spec['type'](value)
+        except (TypeError, ValueError):
+            raise ValueError(value)
+    if 'choices' in spec and value not in spec['choices']:
+        raise ValueError(value)
+    return value
+
+_tables = None  # built from ARGUMENTS on first use
+
+def scan_args(argv) -> Args | None:
+    """Parse the common argument shapes without argparse; None means defer to it."""
+    global _tables
+    if _tables is None:
+        _tables = _fast_path_tables()
+    defaults, flags, options, positionals, required = _tables
+    
+    args = Args()
+    args.__dict__.update(defaults)
+    seen = set()
+    next_positional = 0
+    try:
+        i = 0
+        while i < len(argv):
+            arg = argv[i]
+            if arg in flags:
+                dest, value = flags[arg]
+                setattr(args, dest, value)
+            elif arg.startswith('-') and arg != '-':
+                name, eq, value = arg.partition('=')
+                if name not in options or (eq and not name.startswith('--')):
+                    # --help, --version, bundled flags and unknown options get
+                    # argparse's handling and error messages
+                    return None
+                if not eq:
+                    i += 1
+                    if i == len(argv) or argv[i].startswith('-'):
+                        return None
+                    value = argv[i]
+                dest, spec = options[name]
+                setattr(args, dest, _convert(spec, value))
+                seen.add(dest)
+            else:
+                if next_positional == len(positionals) or positionals[next_positional] is None:
+                    return None  # extra or variable-length positionals
+                dest, spec = positionals[next_positional]
+                next_positional += 1
+                setattr(args, dest, _convert(spec, arg))
+                seen.add(dest)
+            i += 1
+    except ValueError:
+        return None
+    return args if required <= seen else None
+
+_parser = None  # built on first use, then reused by every --serve command
+
+def get_parser() -> 'argparse.ArgumentParser':
+    """Return the full parser, used for help, version and error reporting."""
+    global _parser
+    if _parser is None:
+        _parser = build_parser()
+    return _parser
+
+def build_parser() -> 'argparse.ArgumentParser':
+    """Build the full parser."""
+    import argparse
     parser = argparse.ArgumentParser(
         description='Brief tool description',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -19,60 +175,106 @@ Examples:
   %(prog)s input.txt
   %(prog)s --json data.csv
   %(prog)s --verbose --output results.json
+  printf '%%s\\n' 'a.json --json' 'b.json --json' | %(prog)s --serve
         """
     )
     
-    # Positional arguments
-    parser.add_argument('input', nargs='?', help='Input file or data')
-    
-    # Optional arguments
-    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
-    parser.add_argument('--json', action='store_true', help='Output as JSON')
-    parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
-    parser.add_argument('--version', action='version', version='%(prog)s 1.0.0')
-    
-    args = parser.parse_args()
+    for names, spec in ARGUMENTS:
+        parser.add_argument(*names, **spec)
     
+    return parser
+
+def run(args) -> int:
+    """Run one invocation and return its exit code."""
     try:
         # Tool logic here
         result = process_input(args)
         
-        # Output handling
+        # Output handling; kept as bytes all the way to the file descriptor
         if args.json:
-            output = json.dumps(result, indent=2)
+            output = dump_json(result)
         else:
             output = format_human_output(result)
         
         if args.output:
-            with open(args.output, 'w') as f:
-                f.write(output)
+            fd = os.open(args.output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                write_all(fd, output)
+            finally:
+                os.close(fd)
             if args.verbose:
                 print(f"Output written to {args.output}", file=sys.stderr)
         else:
-            print(output)
+            sys.stdout.flush()
+            write_all(sys.stdout.fileno(), output + b"\n")
             
     except FileNotFoundError as e:
         print(f"Error: File not found - {e}", file=sys.stderr)
-        sys.exit(1)
+        return 1
     except ValueError as e:
         print(f"Error: Invalid input - {e}", file=sys.stderr)
-        sys.exit(2)
+        return 2
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+        return 1
+    return 0
+
+def serve() -> int:
+    """Run one command line per stdin line, reusing this process and its parser.
 
-def process_input(args) -> Dict[str, Any]:
+    Returns the first non-zero exit code among the lines, or 0 if all succeeded.
+    """
+    import shlex
+    status = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            argv = shlex.split(line)
+            args = scan_args(argv) or get_parser().parse_args(argv)
+        except ValueError as e:
+            print(f"Error: Invalid input - {e}", file=sys.stderr)
+            status = status or 2
+            continue
+        except SystemExit as e:
+            # argparse has already printed help, the version or the error
+            status = status or e.code or 0
+            continue
+        finally:
+            sys.stdout.flush()
+        try:
+            code = run(args)
+        except Exception as e:  # one bad line shouldn't take the server down
+            print(f"Error: {e}", file=sys.stderr)
+            code = 1
+        finally:
+            sys.stdout.flush()
+        status = status or code
+    return status
+
+def main():
+    args = scan_args(sys.argv[1:]) or get_parser().parse_args()
+    sys.exit(serve() if args.serve else run(args))
+
+def process_input(args) -> dict:
     """Process the input and return results."""
     # TODO: Implement actual logic
-    return {
+    result = {
         "status": "success",
         "input": args.input,
         "message": "Tool executed successfully"
     }
+    if args.input and args.input.endswith('.json'):
+        result["data"] = load_json(args.input)
+    return result
+
+# Fixed labels of the human-readable output, encoded once
+STATUS_LABEL = b"Status: "
+MESSAGE_LABEL = b"\nMessage: "
 
-def format_human_output(result: Dict[str, Any]) -> str:
+def format_human_output(result: dict) -> bytes:
     """Format output for human readability."""
-    return f"Status: {result['status']}\nMessage: {result['message']}"
+    return STATUS_LABEL + result['status'].encode() + MESSAGE_LABEL + result['message'].encode()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file